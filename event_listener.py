@@ -1,25 +1,63 @@
 """
 졸림/하품 이벤트 수신 예제
 main.py가 실행 중일 때 이 스크립트를 실행하세요.
+
+examples/의 예제 핸들러를 함께 실행할 수도 있습니다 (파이프는 한 번만 읽음):
+    python event_listener.py alert automation stats webhook
+
+파이프 프레임 규약 (main.py를 수정할 때 유지할 것):
+    - 이벤트는 줄바꿈으로 구분: "DROWSY\n", "YAWN\n"
+    - 한 번의 write()에 여러 이벤트를 담을 수 있음 (예: "DROWSY\nYAWN\n")
+    - write() 한 번은 PIPE_BUF(4KB) 이하로 유지 (원자적 쓰기, 다른 송신자와 섞이지 않음)
 """
 
-PIPE_PATH = "/tmp/face_status_pipe"
+import importlib
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "examples"))
+
+from pipe_events import PIPE_PATH, run
+
+# 함께 실행할 수 있는 예제 핸들러
+EXAMPLE_MODULES = {
+    "alert": "drowsy_alert_example",
+    "automation": "drowsy_automation_example",
+    "stats": "drowsy_statistics_example",
+    "webhook": "drowsy_webhook_example",
+}
+
+
+async def print_event(event):
+    if event == "DROWSY":
+        print(f"[수신] 졸림 감지됨!")
+        # 여기에 졸림 감지 시 처리할 로직 추가
+    elif event == "YAWN":
+        print(f"[수신] 하품 감지됨!")
+        # 여기에 하품 감지 시 처리할 로직 추가
+
 
 def main():
+    names = sys.argv[1:]
+    unknown = [name for name in names if name not in EXAMPLE_MODULES]
+    if unknown:
+        print(f"알 수 없는 예제: {', '.join(unknown)}")
+        print(f"사용 가능: {', '.join(EXAMPLE_MODULES)}")
+        return
+
+    handlers = [print_event]
+    for name in names:
+        module = importlib.import_module(EXAMPLE_MODULES[name])
+        handlers.append(module.create_handler())
+
     print("이벤트 대기 중... (main.py를 먼저 실행하세요)")
     print(f"파이프: {PIPE_PATH}")
+    if names:
+        print(f"함께 실행: {', '.join(names)}")
     print("-" * 40)
 
-    with open(PIPE_PATH, 'r') as pipe:
-        while True:
-            event = pipe.readline().strip()
-            if event:
-                if event == "DROWSY":
-                    print(f"[수신] 졸림 감지됨!")
-                    # 여기에 졸림 감지 시 처리할 로직 추가
-                elif event == "YAWN":
-                    print(f"[수신] 하품 감지됨!")
-                    # 여기에 하품 감지 시 처리할 로직 추가
+    run(*handlers)
 
 
 if __name__ == "__main__":
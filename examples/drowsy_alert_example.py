@@ -9,11 +9,16 @@ main.py에서 전송하는 졸림/하품 이벤트를 수신하여
 2. 터미널 2에서 이 스크립트 실행
 """
 
+import asyncio
+import atexit
 import os
 import subprocess
-from datetime import datetime
 
-PIPE_PATH = "/tmp/face_status_pipe"
+from pipe_events import PIPE_PATH, clock, run
+
+LOG_FILE = "drowsy_log.txt"
+LOG_FH = open(LOG_FILE, "a", buffering=1)  # 한 번만 열어 두고 줄 단위로 기록 (O_APPEND)
+atexit.register(LOG_FH.close)
 
 
 def play_custom_sound(sound_name="Ping"):
@@ -27,22 +32,24 @@ def play_custom_sound(sound_name="Ping"):
         )
 
 
-def show_notification(title, message):
+async def show_notification(title, message):
     """macOS 알림 센터에 알림 표시"""
     script = f'display notification "{message}" with title "{title}"'
-    subprocess.run(['osascript', '-e', script], capture_output=True)
+    proc = await asyncio.create_subprocess_exec(
+        'osascript', '-e', script,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    await proc.wait()
 
 
 def log_event(event_type):
     """이벤트를 파일에 기록"""
-    log_file = "drowsy_log.txt"
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(log_file, 'a') as f:
-        f.write(f"[{timestamp}] {event_type}\n")
-    print(f"로그 저장: {log_file}")
+    LOG_FH.write(f"[{clock.datetime_str}] {event_type}\n")
+    print(f"로그 저장: {LOG_FILE}")
 
 
-def on_drowsy():
+async def on_drowsy():
     """졸림 감지 시 처리"""
     print("=" * 50)
     print("⚠️  졸림 감지!")
@@ -51,14 +58,14 @@ def on_drowsy():
     # 1. 경고음 재생
     play_custom_sound("Glass")
 
-    # 2. 시스템 알림 표시
-    show_notification("졸림 경고", "눈을 2초 이상 감았습니다. 잠시 휴식하세요!")
-
-    # 3. 로그 기록
+    # 2. 로그 기록
     log_event("DROWSY")
 
+    # 3. 시스템 알림 표시
+    await show_notification("졸림 경고", "눈을 2초 이상 감았습니다. 잠시 휴식하세요!")
+
 
-def on_yawn():
+async def on_yawn():
     """하품 감지 시 처리"""
     print("=" * 50)
     print("😮 하품 감지!")
@@ -67,12 +74,32 @@ def on_yawn():
     # 1. 경고음 재생
     play_custom_sound("Tink")
 
-    # 2. 시스템 알림 표시
-    show_notification("하품 감지", "하품이 감지되었습니다. 환기하거나 스트레칭하세요!")
-
-    # 3. 로그 기록
+    # 2. 로그 기록
     log_event("YAWN")
 
+    # 3. 시스템 알림 표시
+    await show_notification("하품 감지", "하품이 감지되었습니다. 환기하거나 스트레칭하세요!")
+
+
+def create_handler():
+    """이벤트 핸들러 생성 (event_listener.py에서 다른 예제와 함께 실행 가능)"""
+    counts = {"DROWSY": 0, "YAWN": 0}
+
+    async def handle_event(event):
+        counts[event] += 1
+        timestamp = clock.time_str
+        if event == "DROWSY":
+            print(f"\n[{timestamp}] 졸림 #{counts['DROWSY']}")
+            await on_drowsy()
+        elif event == "YAWN":
+            print(f"\n[{timestamp}] 하품 #{counts['YAWN']}")
+            await on_yawn()
+
+        print(f"\n누적: 졸림 {counts['DROWSY']}회 | 하품 {counts['YAWN']}회")
+        print("-" * 40)
+
+    return handle_event
+
 
 def main():
     print("╔══════════════════════════════════════╗")
@@ -85,25 +112,7 @@ def main():
     print("대기 중...")
     print("-" * 40)
 
-    drowsy_count = 0
-    yawn_count = 0
-
-    with open(PIPE_PATH, 'r') as pipe:
-        while True:
-            event = pipe.readline().strip()
-            if event:
-                if event == "DROWSY":
-                    drowsy_count += 1
-                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 졸림 #{drowsy_count}")
-                    on_drowsy()
-
-                elif event == "YAWN":
-                    yawn_count += 1
-                    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 하품 #{yawn_count}")
-                    on_yawn()
-
-                print(f"\n누적: 졸림 {drowsy_count}회 | 하품 {yawn_count}회")
-                print("-" * 40)
+    run(create_handler())
 
 
 if __name__ == "__main__":
@@ -11,21 +11,67 @@
 2. 터미널 2에서 이 스크립트 실행
 """
 
+import asyncio
 import os
 import subprocess
-from datetime import datetime
 
-PIPE_PATH = "/tmp/face_status_pipe"
+from pipe_events import PIPE_PATH, clock, run
 
 
-def set_screen_brightness(level):
+async def run_command(*args, timeout=5):
+    """외부 명령 실행 (이벤트 루프를 막지 않음)"""
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        raise
+
+
+class AppleScriptShell:
+    """
+    osascript 인터프리터(-i)를 한 번만 실행해 두고 스크립트를 stdin으로 전달
+    이벤트마다 osascript를 새로 실행(fork/exec)하지 않음
+    """
+
+    def __init__(self):
+        self.proc = None
+        self.lock = asyncio.Lock()
+
+    async def run(self, script):
+        """한 줄짜리 AppleScript 실행 (완료를 기다리지 않음)"""
+        async with self.lock:
+            if self.proc is None or self.proc.returncode is not None:
+                self.proc = await asyncio.create_subprocess_exec(
+                    'osascript', '-i',
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+            self.proc.stdin.write((script + "\n").encode())
+            await self.proc.stdin.drain()
+
+
+def applescript_string(text):
+    """AppleScript 문자열 리터럴로 변환"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+osascript = AppleScriptShell()
+
+
+async def set_screen_brightness(level):
     """
     화면 밝기 조절 (0.0 ~ 1.0)
     주의: brightness 명령어가 필요합니다
     설치: brew install brightness
     """
     try:
-        subprocess.run(['brightness', str(level)], capture_output=True, timeout=5)
+        await run_command('brightness', str(level))
         print(f"  화면 밝기: {int(level * 100)}%")
     except FileNotFoundError:
         print("  [밝기 조절 불가] 'brew install brightness'로 설치하세요")
@@ -33,100 +79,108 @@ def set_screen_brightness(level):
         print(f"  밝기 조절 실패: {e}")
 
 
-def control_music(action):
+async def control_music(action):
     """
     음악 재생 제어 (Music 앱)
     action: 'play', 'pause', 'next'
     """
     script = f'tell application "Music" to {action}'
     try:
-        subprocess.run(['osascript', '-e', script], capture_output=True, timeout=5)
+        await osascript.run(script)
         print(f"  Music 앱: {action}")
     except Exception as e:
         print(f"  Music 제어 실패: {e}")
 
 
-def pause_video():
+async def pause_video():
     """동영상 재생 일시정지 (스페이스바 시뮬레이션)"""
-    script = '''
-    tell application "System Events"
-        key code 49
-    end tell
-    '''
+    script = 'tell application "System Events" to key code 49'
     try:
-        subprocess.run(['osascript', '-e', script], capture_output=True, timeout=5)
+        await osascript.run(script)
         print("  스페이스바 전송 (동영상 일시정지)")
     except Exception as e:
         print(f"  키 전송 실패: {e}")
 
 
-def speak_alert(message):
+async def speak_alert(message):
     """TTS로 경고 메시지 음성 출력"""
+    # Yuna: 한국어 음성, 말하는 동안 다음 스크립트를 막지 않음
+    script = f'say {applescript_string(message)} using "Yuna" waiting until completion false'
     try:
-        subprocess.Popen(
-            ['say', '-v', 'Yuna', message],  # Yuna: 한국어 음성
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
+        await osascript.run(script)
         print(f"  음성 출력: {message}")
     except Exception as e:
         print(f"  음성 출력 실패: {e}")
 
 
-def open_app(app_name):
+async def open_app(app_name):
     """애플리케이션 실행"""
     try:
-        subprocess.run(['open', '-a', app_name], capture_output=True, timeout=5)
+        await run_command('open', '-a', app_name)
         print(f"  앱 실행: {app_name}")
     except Exception as e:
         print(f"  앱 실행 실패: {e}")
 
 
-def lock_screen():
+async def lock_screen():
     """화면 잠금"""
     script = 'tell application "System Events" to keystroke "q" using {command down, control down}'
     try:
-        subprocess.run(['osascript', '-e', script], capture_output=True, timeout=5)
+        await osascript.run(script)
         print("  화면 잠금 실행")
     except Exception as e:
         print(f"  화면 잠금 실패: {e}")
 
 
-def on_drowsy(count):
+async def on_drowsy(count):
     """졸림 감지 시 자동화 작업"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    timestamp = clock.time_str
     print(f"\n[{timestamp}] 졸림 감지 #{count}")
     print("자동화 작업 실행 중...")
 
     # 1. 음성 경고
-    speak_alert("졸리시면 잠시 쉬세요")
-
-    # 2. 음악 일시정지 (재생 중이라면)
-    control_music("pause")
+    await speak_alert("졸리시면 잠시 쉬세요")
 
-    # 3. 화면 밝기 올리기
-    set_screen_brightness(1.0)
+    # 2. 음악 일시정지 (재생 중이라면) + 3. 화면 밝기 올리기 (동시 실행)
+    await asyncio.gather(
+        control_music("pause"),
+        set_screen_brightness(1.0),
+    )
 
     # 4. 3번 이상 졸리면 강제 휴식 권유
     if count >= 3:
         print("\n⚠️ 3회 이상 졸림 감지 - 강제 휴식 권유!")
-        speak_alert("지금 바로 10분간 휴식하세요")
-        # lock_screen()  # 필요시 주석 해제
+        await speak_alert("지금 바로 10분간 휴식하세요")
+        # await lock_screen()  # 필요시 주석 해제
 
 
-def on_yawn(count):
+async def on_yawn(count):
     """하품 감지 시 자동화 작업"""
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    timestamp = clock.time_str
     print(f"\n[{timestamp}] 하품 감지 #{count}")
     print("자동화 작업 실행 중...")
 
     # 1. 음성 안내
-    speak_alert("하품이 나왔네요. 스트레칭하세요")
+    await speak_alert("하품이 나왔네요. 스트레칭하세요")
 
     # 5번 이상 하품하면 휴식 권유
     if count >= 5:
         print("\n💤 5회 이상 하품 - 피로 누적!")
-        speak_alert("많이 피곤하신 것 같아요. 잠시 쉬어가세요")
+        await speak_alert("많이 피곤하신 것 같아요. 잠시 쉬어가세요")
+
+
+def create_handler():
+    """이벤트 핸들러 생성 (event_listener.py에서 다른 예제와 함께 실행 가능)"""
+    counts = {"DROWSY": 0, "YAWN": 0}
+
+    async def handle_event(event):
+        counts[event] += 1
+        if event == "DROWSY":
+            await on_drowsy(counts["DROWSY"])
+        elif event == "YAWN":
+            await on_yawn(counts["YAWN"])
+
+    return handle_event
 
 
 def main():
@@ -144,18 +198,7 @@ def main():
     print("main.py를 먼저 실행하세요!")
     print("-" * 50)
 
-    drowsy_count = 0
-    yawn_count = 0
-
-    with open(PIPE_PATH, 'r') as pipe:
-        while True:
-            event = pipe.readline().strip()
-            if event == "DROWSY":
-                drowsy_count += 1
-                on_drowsy(drowsy_count)
-            elif event == "YAWN":
-                yawn_count += 1
-                on_yawn(yawn_count)
+    run(create_handler())
 
 
 if __name__ == "__main__":
@@ -11,58 +11,112 @@
 
 import os
 import json
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from collections import defaultdict
 
-PIPE_PATH = "/tmp/face_status_pipe"
-STATS_FILE = "drowsy_statistics.json"
+from pipe_events import PIPE_PATH, clock, run
+
+STATS_FILE = "drowsy_statistics.json"      # 집계 스냅샷
+EVENT_LOG_FILE = "drowsy_statistics.ndjson"  # 스냅샷 이후 이벤트 (한 줄에 하나, 추가만 함)
+SNAPSHOT_EVERY = 1000                        # 로그에 이만큼 쌓이면 스냅샷 저장 후 로그 비움
+
+
+def empty_counts():
+    return {'DROWSY': 0, 'YAWN': 0}
 
 
 class DrowsyStatistics:
     def __init__(self):
-        self.events = []
-        self.session_start = datetime.now()
+        self.session_start = time.monotonic()
+        self.session_counts = empty_counts()
+        self.daily = defaultdict(empty_counts)    # 'YYYY-MM-DD' -> 이벤트 수
+        self.hourly = defaultdict(empty_counts)   # 시(0~23) -> 이벤트 수
+        self.log_count = 0                        # 마지막 스냅샷 이후 로그에 기록된 이벤트 수
+        self.seq = 0                              # 마지막 이벤트 번호 (로그 한 줄마다 1씩 증가)
         self.load_stats()
+        self.log_file = open(EVENT_LOG_FILE, 'ab', buffering=0)
+
+    def count_event(self, event):
+        """이벤트를 날짜/시간대 집계에 반영"""
+        event_type = event['type']
+        self.daily[event['timestamp'][:10]][event_type] += 1
+        self.hourly[event.get('hour', 0)][event_type] += 1
 
     def load_stats(self):
-        """저장된 통계 로드"""
+        """저장된 통계 로드 (스냅샷 + 이후 이벤트 로그)"""
         if os.path.exists(STATS_FILE):
             try:
                 with open(STATS_FILE, 'r') as f:
                     data = json.load(f)
-                    self.events = data.get('events', [])
-                    print(f"기존 통계 로드: {len(self.events)}개 이벤트")
+                # 이전 형식: 모든 이벤트 목록
+                for event in data.get('events', []):
+                    self.count_event(event)
+                for date, counts in data.get('daily', {}).items():
+                    self.daily[date].update(counts)
+                for hour, counts in data.get('hourly', {}).items():
+                    self.hourly[int(hour)].update(counts)
+                self.seq = data.get('last_seq', 0)
             except:
-                self.events = []
+                self.daily.clear()
+                self.hourly.clear()
+                self.seq = 0
+
+        # 스냅샷 저장 직후(로그 비우기 전)에 종료됐으면 로그에 스냅샷에 이미 들어간 이벤트가 남아 있음
+        # -> 이벤트 번호가 스냅샷의 last_seq 이하인 줄은 건너뜀
+        snapshot_seq = self.seq
+        if os.path.exists(EVENT_LOG_FILE):
+            with open(EVENT_LOG_FILE, 'rb') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 중 잘린 줄
+                    seq = event.get('seq')
+                    if seq is not None:
+                        if seq <= snapshot_seq:
+                            continue
+                        self.seq = max(self.seq, seq)
+                    self.count_event(event)
+                    self.log_count += 1
+
+        total = sum(c['DROWSY'] + c['YAWN'] for c in self.daily.values())
+        if total:
+            print(f"기존 통계 로드: {total}개 이벤트")
 
     def save_stats(self):
-        """통계 저장"""
-        with open(STATS_FILE, 'w') as f:
-            json.dump({'events': self.events}, f, indent=2)
+        """집계 스냅샷 저장 후 이벤트 로그 비우기"""
+        tmp_file = STATS_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({'daily': self.daily, 'hourly': self.hourly, 'last_seq': self.seq}, f, indent=2)
+        os.replace(tmp_file, STATS_FILE)
+        self.log_file.truncate(0)
+        self.log_count = 0
 
     def add_event(self, event_type):
-        """이벤트 추가"""
+        """이벤트 추가 (로그 끝에 한 줄만 기록)"""
+        self.seq += 1
         event = {
+            'seq': self.seq,
             'type': event_type,
-            'timestamp': datetime.now().isoformat(),
-            'hour': datetime.now().hour
+            'timestamp': clock.datetime_str,
+            'hour': clock.now.tm_hour
         }
-        self.events.append(event)
-        self.save_stats()
+        self.count_event(event)
+        self.session_counts[event_type] += 1
+
+        self.log_file.write(json.dumps(event).encode() + b"\n")
+        self.log_count += 1
+        if self.log_count >= SNAPSHOT_EVERY:
+            self.save_stats()
         return event
 
     def get_session_stats(self):
         """현재 세션 통계"""
-        session_events = [
-            e for e in self.events
-            if datetime.fromisoformat(e['timestamp']) >= self.session_start
-        ]
-
-        drowsy = sum(1 for e in session_events if e['type'] == 'DROWSY')
-        yawn = sum(1 for e in session_events if e['type'] == 'YAWN')
+        drowsy = self.session_counts['DROWSY']
+        yawn = self.session_counts['YAWN']
 
-        duration = datetime.now() - self.session_start
-        minutes = int(duration.total_seconds() / 60)
+        minutes = int((time.monotonic() - self.session_start) / 60)
 
         return {
             'duration_minutes': minutes,
@@ -73,25 +127,13 @@ class DrowsyStatistics:
 
     def get_hourly_distribution(self):
         """시간대별 이벤트 분포"""
-        hourly = defaultdict(lambda: {'DROWSY': 0, 'YAWN': 0})
-
-        for event in self.events:
-            hour = event.get('hour', 0)
-            event_type = event['type']
-            hourly[hour][event_type] += 1
-
-        return dict(hourly)
+        return dict(self.hourly)
 
     def get_today_stats(self):
         """오늘의 통계"""
-        today = datetime.now().date()
-        today_events = [
-            e for e in self.events
-            if datetime.fromisoformat(e['timestamp']).date() == today
-        ]
-
-        drowsy = sum(1 for e in today_events if e['type'] == 'DROWSY')
-        yawn = sum(1 for e in today_events if e['type'] == 'YAWN')
+        today = self.daily.get(datetime.now().date().isoformat(), empty_counts())
+        drowsy = today['DROWSY']
+        yawn = today['YAWN']
 
         return {'drowsy': drowsy, 'yawn': yawn, 'total': drowsy + yawn}
 
@@ -139,12 +181,29 @@ class DrowsyStatistics:
         print("\n" + "=" * 50)
 
 
+def create_handler(stats=None):
+    """이벤트 핸들러 생성 (event_listener.py에서 다른 예제와 함께 실행 가능)"""
+    if stats is None:
+        stats = DrowsyStatistics()
+
+    async def handle_event(event):
+        timestamp = clock.time_str
+        stats.add_event(event)
+
+        session = stats.get_session_stats()
+        print(f"[{timestamp}] {event} | "
+              f"세션: {session['drowsy_count']}D/{session['yawn_count']}Y | "
+              f"경과: {session['duration_minutes']}분")
+
+    return handle_event
+
+
 def main():
     print("╔══════════════════════════════════════╗")
     print("║    졸림 감지 통계 수집 예제          ║")
     print("╚══════════════════════════════════════╝")
     print()
-    print(f"통계 파일: {STATS_FILE}")
+    print(f"통계 파일: {STATS_FILE} (이벤트 로그: {EVENT_LOG_FILE})")
     print(f"파이프 경로: {PIPE_PATH}")
     print("main.py를 먼저 실행하세요!")
     print()
@@ -156,17 +215,7 @@ def main():
 
     print("\n이벤트 대기 중...")
 
-    with open(PIPE_PATH, 'r') as pipe:
-        while True:
-            event = pipe.readline().strip()
-            if event in ("DROWSY", "YAWN"):
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                stats.add_event(event)
-
-                session = stats.get_session_stats()
-                print(f"[{timestamp}] {event} | "
-                      f"세션: {session['drowsy_count']}D/{session['yawn_count']}Y | "
-                      f"경과: {session['duration_minutes']}분")
+    run(create_handler(stats))
 
 
 if __name__ == "__main__":
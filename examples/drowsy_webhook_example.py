@@ -9,112 +9,160 @@ Slack, Discord, 또는 자체 서버로 알림을 전송할 수 있습니다.
 2. 터미널 2에서 이 스크립트 실행
 """
 
+import asyncio
 import os
-import json
-import urllib.request
-from datetime import datetime
 
-PIPE_PATH = "/tmp/face_status_pipe"
+import aiohttp  # 설치: pip install aiohttp orjson
+import orjson
+
+from pipe_events import PIPE_PATH, clock, run
 
 # Webhook URL 설정 (실제 사용 시 변경 필요)
 SLACK_WEBHOOK_URL = None  # "https://hooks.slack.com/services/xxx/yyy/zzz"
 DISCORD_WEBHOOK_URL = None  # "https://discord.com/api/webhooks/xxx/yyy"
 CUSTOM_WEBHOOK_URL = None  # "https://your-server.com/api/drowsy-alert"
 
+BATCH_WINDOW = 0.5        # 이 시간(초) 안에 들어온 이벤트는 메시지 하나로 묶어서 전송
+DISCORD_MAX_EMBEDS = 10   # Discord 메시지 하나에 넣을 수 있는 embed 최대 개수
+SLACK_MAX_BLOCKS = 50     # Slack 메시지 하나에 넣을 수 있는 block 최대 개수
+
+
+def describe(event_type):
+    """이벤트별 이모지/메시지"""
+    if event_type == "DROWSY":
+        return "😴", "졸림이 감지되었습니다!"
+    return "🥱", "하품이 감지되었습니다!"
+
 
-def send_slack_webhook(event_type, timestamp):
-    """Slack으로 알림 전송"""
+async def send_slack_webhook(session, events):
+    """Slack으로 알림 전송 (이벤트 여러 개를 메시지 하나로)"""
     if not SLACK_WEBHOOK_URL:
         print("  [Slack] URL 미설정 - 건너뜀")
         return
 
-    emoji = "😴" if event_type == "DROWSY" else "🥱"
-    message = "졸림이 감지되었습니다!" if event_type == "DROWSY" else "하품이 감지되었습니다!"
-
-    payload = {
-        "text": f"{emoji} *{message}*",
-        "blocks": [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"{emoji} *{message}*\n시간: {timestamp}"
-                }
+    blocks = []
+    for event_type, timestamp in events:
+        emoji, message = describe(event_type)
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"{emoji} *{message}*\n시간: {timestamp}"
             }
-        ]
-    }
+        })
+
+    emoji, message = describe(events[-1][0])
+    text = f"{emoji} *{message}*" if len(events) == 1 else f"{emoji} *이벤트 {len(events)}건 감지*"
 
     try:
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(SLACK_WEBHOOK_URL, data=data)
-        req.add_header('Content-Type', 'application/json')
-        urllib.request.urlopen(req, timeout=5)
+        for i in range(0, len(blocks), SLACK_MAX_BLOCKS):
+            payload = {"text": text, "blocks": blocks[i:i + SLACK_MAX_BLOCKS]}
+            async with session.post(SLACK_WEBHOOK_URL, json=payload) as resp:
+                resp.raise_for_status()
         print("  [Slack] 전송 성공")
     except Exception as e:
         print(f"  [Slack] 전송 실패: {e}")
 
 
-def send_discord_webhook(event_type, timestamp):
-    """Discord로 알림 전송"""
+async def send_discord_webhook(session, events):
+    """Discord로 알림 전송 (이벤트 여러 개를 embed 목록으로)"""
     if not DISCORD_WEBHOOK_URL:
         print("  [Discord] URL 미설정 - 건너뜀")
         return
 
-    emoji = "😴" if event_type == "DROWSY" else "🥱"
-    title = "졸림 감지!" if event_type == "DROWSY" else "하품 감지!"
-    color = 0xFF0000 if event_type == "DROWSY" else 0xFFA500
-
-    payload = {
-        "embeds": [{
+    embeds = []
+    for event_type, timestamp in events:
+        emoji = "😴" if event_type == "DROWSY" else "🥱"
+        title = "졸림 감지!" if event_type == "DROWSY" else "하품 감지!"
+        color = 0xFF0000 if event_type == "DROWSY" else 0xFFA500
+        embeds.append({
             "title": f"{emoji} {title}",
             "description": f"시간: {timestamp}",
             "color": color
-        }]
-    }
+        })
 
     try:
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(DISCORD_WEBHOOK_URL, data=data)
-        req.add_header('Content-Type', 'application/json')
-        urllib.request.urlopen(req, timeout=5)
+        for i in range(0, len(embeds), DISCORD_MAX_EMBEDS):
+            payload = {"embeds": embeds[i:i + DISCORD_MAX_EMBEDS]}
+            async with session.post(DISCORD_WEBHOOK_URL, json=payload) as resp:
+                resp.raise_for_status()
         print("  [Discord] 전송 성공")
     except Exception as e:
         print(f"  [Discord] 전송 실패: {e}")
 
 
-def send_custom_webhook(event_type, timestamp):
-    """커스텀 서버로 알림 전송"""
+async def send_custom_webhook(session, events):
+    """커스텀 서버로 알림 전송 (이벤트 목록을 한 번에)"""
     if not CUSTOM_WEBHOOK_URL:
         print("  [Custom] URL 미설정 - 건너뜀")
         return
 
     payload = {
-        "event": event_type,
-        "timestamp": timestamp,
+        "events": [
+            {"event": event_type, "timestamp": timestamp}
+            for event_type, timestamp in events
+        ],
         "device": "MacBook",
         "source": "FacialExpressions"
     }
 
     try:
-        data = json.dumps(payload).encode('utf-8')
-        req = urllib.request.Request(CUSTOM_WEBHOOK_URL, data=data)
-        req.add_header('Content-Type', 'application/json')
-        urllib.request.urlopen(req, timeout=5)
+        async with session.post(CUSTOM_WEBHOOK_URL, json=payload) as resp:
+            resp.raise_for_status()
         print("  [Custom] 전송 성공")
     except Exception as e:
         print(f"  [Custom] 전송 실패: {e}")
 
 
-def on_event(event_type):
-    """이벤트 발생 시 모든 웹훅으로 전송"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    print(f"\n[{timestamp}] {event_type} 이벤트 수신")
-    print("웹훅 전송 중...")
-
-    send_slack_webhook(event_type, timestamp)
-    send_discord_webhook(event_type, timestamp)
-    send_custom_webhook(event_type, timestamp)
+class BatchedWebhook:
+    """
+    이벤트를 BATCH_WINDOW 동안 모았다가 웹훅마다 한 번만 전송
+    HTTP 연결은 세션 하나로 재사용 (keep-alive)
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self.task = None
+
+    async def put(self, event_type, timestamp):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+        await self.queue.put((event_type, timestamp))
+
+    async def _run(self):
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=5),
+            json_serialize=lambda payload: orjson.dumps(payload).decode(),  # json= 인자 직렬화를 orjson으로
+        )
+        try:
+            while True:
+                events = [await self.queue.get()]
+                await asyncio.sleep(BATCH_WINDOW)
+                while not self.queue.empty():
+                    events.append(self.queue.get_nowait())
+
+                print(f"\n웹훅 전송 중... ({len(events)}개 이벤트)")
+                await asyncio.gather(
+                    send_slack_webhook(session, events),
+                    send_discord_webhook(session, events),
+                    send_custom_webhook(session, events),
+                )
+        finally:
+            await session.close()
+
+
+def create_handler():
+    """이벤트 핸들러 생성 (event_listener.py에서 다른 예제와 함께 실행 가능)"""
+    webhook = BatchedWebhook()
+
+    async def on_event(event_type):
+        """이벤트를 전송 대기열에 추가"""
+        timestamp = clock.datetime_str
+        print(f"\n[{timestamp}] {event_type} 이벤트 수신")
+        await webhook.put(event_type, timestamp)
+
+    return on_event
 
 
 def main():
@@ -133,11 +181,7 @@ def main():
     print("main.py를 먼저 실행하세요!")
     print("-" * 40)
 
-    with open(PIPE_PATH, 'r') as pipe:
-        while True:
-            event = pipe.readline().strip()
-            if event in ("DROWSY", "YAWN"):
-                on_event(event)
+    run(create_handler())
 
 
 if __name__ == "__main__":
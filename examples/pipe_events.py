@@ -0,0 +1,174 @@
+"""
+Named Pipe 이벤트 수신 공용 모듈
+================================
+main.py가 보내는 이벤트를 asyncio로 한 번만 읽어서
+등록된 모든 핸들러(코루틴)에 동시에 전달합니다.
+
+사용법:
+    async def on_event(event):
+        print(event)  # "DROWSY" 또는 "YAWN"
+
+    run(on_event)
+
+프레임 규약 (main.py와 공유):
+    이벤트는 줄바꿈으로 구분 ("DROWSY\n", "YAWN\n")
+    한 번의 write()/read()에 여러 이벤트가 들어올 수 있고, 줄이 중간에 잘려 올 수도 있음
+"""
+
+import asyncio
+import os
+import time
+
+PIPE_PATH = "/tmp/face_status_pipe"
+EVENT_TYPES = {b"DROWSY": "DROWSY", b"YAWN": "YAWN"}  # 수신 바이트 -> 핸들러에 전달할 이벤트
+QUEUE_SIZE = 64            # 핸들러별 대기 이벤트 최대 개수
+PIPE_CHECK_INTERVAL = 1.0  # main.py 재시작으로 파이프가 새로 만들어졌는지 확인하는 주기 (초)
+
+
+class WallClock:
+    """
+    1초마다 갱신되는 현재 시각 (핸들러에서 이벤트마다 datetime.now()/strftime을 호출하지 않음)
+    EventHub가 실행 중일 때 갱신됨
+    """
+
+    def __init__(self):
+        self.refresh()
+
+    def refresh(self):
+        self.now = time.localtime()
+        self.time_str = time.strftime("%H:%M:%S", self.now)
+        self.datetime_str = time.strftime("%Y-%m-%d %H:%M:%S", self.now)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(1 - time.time() % 1)  # 다음 초 경계까지
+            self.refresh()
+
+
+clock = WallClock()
+
+
+class PipeProtocol(asyncio.Protocol):
+    """파이프에서 받은 바이트를 줄 단위 이벤트로 나눠 큐에 넣음"""
+
+    def __init__(self, queue, closed):
+        self.queue = queue
+        self.closed = closed
+        self.transport = None
+        self.pending = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        # 한 번의 read()로 받은 여러 이벤트를 한꺼번에 분리 (readline처럼 줄마다 읽지 않음)
+        if self.pending:
+            data = self.pending + data
+        if b"\n" not in data:
+            self.pending = data  # 줄이 아직 끝나지 않음
+            return
+        lines = data.split(b"\n")
+        self.pending = lines.pop()  # 아직 줄바꿈이 오지 않은 나머지 (보통 b"")
+        for line in lines:
+            event = EVENT_TYPES.get(line)
+            if event is not None:
+                self.queue.put_nowait(event)
+
+        # 핸들러가 밀리면 파이프 읽기를 잠시 멈춤 (backpressure)
+        if self.queue.qsize() >= QUEUE_SIZE:
+            self.transport.pause_reading()
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(exc)
+
+
+class EventHub:
+    """파이프를 한 번만 열고, 이벤트를 핸들러별 큐로 나눠 전달"""
+
+    def __init__(self, pipe_path=PIPE_PATH):
+        self.pipe_path = pipe_path
+        self.handlers = []
+        self.transport = None
+
+    def subscribe(self, handler):
+        """async def handler(event) 형태의 핸들러 등록"""
+        self.handlers.append(handler)
+        return handler
+
+    async def run(self):
+        inbound = asyncio.Queue()
+        queues = [asyncio.Queue(QUEUE_SIZE) for _ in self.handlers]
+        tasks = [
+            asyncio.create_task(self._worker(handler, queue))
+            for handler, queue in zip(self.handlers, queues)
+        ]
+        tasks.append(asyncio.create_task(self._dispatch(inbound, queues)))
+        tasks.append(asyncio.create_task(clock.run()))
+
+        try:
+            await self._read_pipe(inbound)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _read_pipe(self, inbound):
+        """
+        파이프를 읽기+쓰기(O_RDWR)로 열어서 계속 읽기
+        허브가 쓰기 쪽도 하나 잡고 있으므로 송신자가 닫아도 EOF가 오지 않고,
+        main.py는 언제든 파이프를 열 수 있음 (수신자가 없는 틈이 없어 이벤트를 잃지 않음)
+        main.py는 시작할 때 파이프를 새로 만들기 때문에, 경로의 inode가 바뀌면 새 파이프로 다시 열기
+        """
+        loop = asyncio.get_running_loop()
+        opened = False
+        while True:
+            try:
+                fd = os.open(self.pipe_path, os.O_RDWR | os.O_NONBLOCK)
+            except FileNotFoundError:
+                if not opened:
+                    raise  # main.py가 아직 실행되지 않음
+                await asyncio.sleep(PIPE_CHECK_INTERVAL)  # main.py가 파이프를 다시 만드는 중
+                continue
+            opened = True
+            inode = os.fstat(fd).st_ino
+            closed = loop.create_future()
+            pipe = os.fdopen(fd, 'rb', buffering=0)
+            self.transport, _ = await loop.connect_read_pipe(
+                lambda: PipeProtocol(inbound, closed), pipe
+            )
+            try:
+                while not closed.done() and not self._pipe_replaced(inode):
+                    await asyncio.wait({closed}, timeout=PIPE_CHECK_INTERVAL)
+            finally:
+                self.transport.close()
+
+    def _pipe_replaced(self, inode):
+        """경로에 다른 파이프가 새로 만들어졌는지 (main.py 재시작)"""
+        try:
+            return os.stat(self.pipe_path).st_ino != inode
+        except FileNotFoundError:
+            return False  # main.py 종료 중 - 새 파이프가 생길 때까지 기존 파이프 유지
+
+    async def _dispatch(self, inbound, queues):
+        while True:
+            event = await inbound.get()
+            await asyncio.gather(*(queue.put(event) for queue in queues))
+            if self.transport is not None and inbound.qsize() < QUEUE_SIZE // 2:
+                self.transport.resume_reading()
+
+    async def _worker(self, handler, queue):
+        while True:
+            event = await queue.get()
+            try:
+                await handler(event)
+            except Exception as e:
+                print(f"핸들러 오류 ({handler.__name__}): {e}")
+
+
+def run(*handlers, pipe_path=PIPE_PATH):
+    """핸들러들을 등록하고 이벤트 수신 시작 (Ctrl+C로 종료)"""
+    hub = EventHub(pipe_path)
+    for handler in handlers:
+        hub.subscribe(handler)
+    asyncio.run(hub.run())
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
 from app.core.database import get_db
@@ -12,9 +12,11 @@ router = APIRouter(prefix="/events", tags=["events"])
 
 
 class EventResponse(BaseModel):
-    id: str
-    user_id: str
-    session_id: str
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    user_id: UUID
+    session_id: UUID
     event_type: str
     ear: Optional[float]
     mar: Optional[float]
@@ -22,9 +24,6 @@ class EventResponse(BaseModel):
     confidence: Optional[float]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class SessionStatsResponse(BaseModel):
     session_id: str
@@ -69,17 +68,5 @@ async def get_recent_events(
 ):
     service = EventService(db)
     events = await service.get_recent_events(user_id, limit)
-    return [
-        EventResponse(
-            id=str(e.id),
-            user_id=str(e.user_id),
-            session_id=str(e.session_id),
-            event_type=e.event_type,
-            ear=e.ear,
-            mar=e.mar,
-            emotion=e.emotion,
-            confidence=e.confidence,
-            created_at=e.created_at,
-        )
-        for e in events
-    ]
+    # Validated straight from the ORM objects by response_model
+    return events
@@ -1,40 +1,84 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from typing import Dict
+from collections import defaultdict
+from typing import Dict, Tuple
 from uuid import UUID, uuid4
-import json
 import logging
+import orjson
 
-from app.core.database import async_session_maker
+from app.core.database import event_listener
 from app.services.event_service import EventService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Replies go out as text frames: the frontend hands event.data straight to JSON.parse
+PONG = orjson.dumps({"type": "pong"}).decode()
+BAD_JSON = orjson.dumps({"type": "error", "message": "Invalid JSON format"}).decode()
+
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-        self.user_sessions: Dict[str, UUID] = {}
+        self.user_sessions: Dict[str, Tuple[UUID, UUID]] = {}
+        self.session_counts: Dict[Tuple[str, UUID], Dict[str, int]] = defaultdict(
+            lambda: {"DROWSY": 0, "YAWN": 0}
+        )
 
-    async def connect(self, websocket: WebSocket, user_id: str) -> UUID:
+    async def connect(self, websocket: WebSocket, user_id: str) -> Tuple[UUID, UUID]:
+        user_uuid = UUID(user_id)  # raises ValueError before accepting
         await websocket.accept()
         session_id = uuid4()
+        # Keyed by the canonical form, which is what NOTIFY payloads carry
+        user_id = str(user_uuid)
         self.active_connections[user_id] = websocket
-        self.user_sessions[user_id] = session_id
+        self.user_sessions[user_id] = (user_uuid, session_id)
         logger.info(f"User {user_id} connected with session {session_id}")
-        return session_id
+        return user_uuid, session_id
 
     def disconnect(self, user_id: str):
         self.active_connections.pop(user_id, None)
-        session_id = self.user_sessions.pop(user_id, None)
+        _, session_id = self.user_sessions.pop(user_id, (None, None))
+        self.session_counts.pop((user_id, session_id), None)
         logger.info(f"User {user_id} disconnected from session {session_id}")
 
     async def send_to_user(self, user_id: str, data: dict):
         if websocket := self.active_connections.get(user_id):
-            await websocket.send_json(data)
+            await websocket.send_text(orjson.dumps(data).decode())
 
     def get_session_id(self, user_id: str) -> UUID | None:
-        return self.user_sessions.get(user_id)
+        if session := self.user_sessions.get(user_id):
+            return session[1]
+        return None
+
+    def count_event(self, user_id: str, session_id: UUID, event_type: str):
+        self.session_counts[(user_id, session_id)][event_type] += 1
+
+    def get_session_stats(self, user_id: str, session_id: UUID) -> dict:
+        counts = self.session_counts[(user_id, session_id)]
+        return {
+            "session_id": str(session_id),
+            "drowsy_count": counts["DROWSY"],
+            "yawn_count": counts["YAWN"],
+            "total_events": counts["DROWSY"] + counts["YAWN"],
+        }
+
+    async def forward_notifications(self):
+        """Relay committed events from the user's other sessions (any worker) to their socket."""
+        queue = event_listener.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                user_id = event["user_id"]
+                session = self.user_sessions.get(user_id)
+                # Events of the connection's own session are already counted in-process
+                if session is None or str(session[1]) == event["session_id"]:
+                    continue
+                try:
+                    await self.send_to_user(user_id, {"type": "event", "data": event})
+                except Exception as e:
+                    logger.warning(f"Failed to forward event to user {user_id}: {e}")
+        finally:
+            event_listener.unsubscribe(queue)
 
 
 manager = ConnectionManager()
@@ -42,30 +86,34 @@ manager = ConnectionManager()
 
 @router.websocket("/ws/events/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    session_id = await manager.connect(websocket, user_id)
+    try:
+        user_uuid, session_id = await manager.connect(websocket, user_id)
+    except ValueError:
+        logger.warning(f"Rejected WebSocket with invalid user id: {user_id}")
+        await websocket.close(code=1008)
+        return
+    user_id = str(user_uuid)  # accept any form UUID() parses, key by the canonical one
 
     # Send session info
-    await websocket.send_json({
+    await websocket.send_text(orjson.dumps({
         "type": "connected",
-        "session_id": str(session_id),
+        "session_id": session_id,
         "message": "Connection established",
-    })
+    }).decode())
 
     try:
-        async with async_session_maker() as db:
-            event_service = EventService(db)
-
-            while True:
-                data = await websocket.receive_text()
-
-                try:
-                    message = json.loads(data)
-                    message_type = message.get("type")
-
-                    if message_type in ["DROWSY", "YAWN"]:
-                        # Log detection event
-                        await event_service.log_event(
-                            user_id=UUID(user_id),
+        while True:
+            data = await websocket.receive_text()
+
+            try:
+                message = orjson.loads(data)
+                message_type = message.get("type")
+
+                if message_type in ["DROWSY", "YAWN"]:
+                    # Queue detection event (written by the batcher)
+                    try:
+                        EventService.log_event(
+                            user_id=user_uuid,
                             session_id=session_id,
                             event_type=message_type,
                             ear=message.get("ear"),
@@ -73,38 +121,32 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
                             emotion=message.get("emotion"),
                             confidence=message.get("confidence"),
                         )
-                        await db.commit()
-
-                        # Get updated stats
-                        stats = await event_service.get_session_stats(
-                            user_id=UUID(user_id),
-                            session_id=session_id,
-                        )
-
-                        await websocket.send_json({
-                            "type": "stats",
-                            "data": stats,
-                        })
-
-                    elif message_type == "ping":
-                        await websocket.send_json({"type": "pong"})
-
-                    elif message_type == "get_stats":
-                        stats = await event_service.get_session_stats(
-                            user_id=UUID(user_id),
-                            session_id=session_id,
-                        )
-                        await websocket.send_json({
-                            "type": "stats",
-                            "data": stats,
-                        })
-
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON from user {user_id}: {data}")
-                    await websocket.send_json({
-                        "type": "error",
-                        "message": "Invalid JSON format",
-                    })
+                    except ValueError as e:
+                        logger.warning(f"Rejected event from user {user_id}: {e}")
+                        await websocket.send_text(orjson.dumps({
+                            "type": "error",
+                            "message": f"Invalid event: {e}",
+                        }).decode())
+                        continue
+                    manager.count_event(user_id, session_id, message_type)
+
+                    await websocket.send_text(orjson.dumps({
+                        "type": "stats",
+                        "data": manager.get_session_stats(user_id, session_id),
+                    }).decode())
+
+                elif message_type == "ping":
+                    await websocket.send_text(PONG)
+
+                elif message_type == "get_stats":
+                    await websocket.send_text(orjson.dumps({
+                        "type": "stats",
+                        "data": manager.get_session_stats(user_id, session_id),
+                    }).decode())
+
+            except orjson.JSONDecodeError:
+                logger.warning(f"Invalid JSON from user {user_id}: {data}")
+                await websocket.send_text(BAD_JSON)
 
     except WebSocketDisconnect:
         manager.disconnect(user_id)
@@ -1,7 +1,18 @@
+import asyncio
+import logging
+from typing import Optional
+
+import asyncpg
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel the event batcher publishes committed detection events on
+EVENT_CHANNEL = "detection_events"
+
 
 class Base(DeclarativeBase):
     pass
@@ -11,6 +22,13 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={
+        # asyncpg: reuse parsed/planned statements for the hot insert/select queries
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
 )
 
 async_session_maker = async_sessionmaker(
@@ -35,3 +53,43 @@ async def get_db() -> AsyncSession:
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+class EventListener:
+    """One LISTEN connection per process, fanned out to in-process subscriber queues."""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.subscribers: set[asyncio.Queue] = set()
+        self._conn: Optional[asyncpg.Connection] = None
+
+    async def start(self):
+        # Dedicated connection outside the pool: LISTEN holds it for the process lifetime
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._conn = await asyncpg.connect(dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+
+    async def stop(self):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def _on_notify(self, conn, pid, channel, payload):
+        try:
+            event = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            logger.warning(f"Ignoring malformed {channel} notification: {payload}")
+            return
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+event_listener = EventListener(EVENT_CHANNEL)
@@ -1,10 +1,13 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, event_listener
+from app.services.event_service import event_batcher
 from app.api import websocket, events, health
 
 # Configure logging
@@ -24,11 +27,22 @@ async def lifespan(app: FastAPI):
         logger.info("Database initialized")
     except Exception as e:
         logger.warning(f"Database initialization skipped: {e}")
+    await event_batcher.start()
+    try:
+        await event_listener.start()
+        logger.info("Listening for detection event notifications")
+    except Exception as e:
+        logger.warning(f"Event notifications disabled: {e}")
+    forward_task = asyncio.create_task(websocket.manager.forward_notifications())
 
     yield
 
     # Shutdown
     logger.info("Shutting down Facial Detection API...")
+    forward_task.cancel()
+    await asyncio.gather(forward_task, return_exceptions=True)
+    await event_batcher.stop()
+    await event_listener.stop()
 
 
 app = FastAPI(
@@ -36,6 +50,7 @@ app = FastAPI(
     description="API for facial expression and drowsiness detection",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
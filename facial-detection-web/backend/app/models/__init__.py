@@ -1,3 +1,3 @@
-from app.models.event import DetectionEvent, User
+from app.models.event import DetectionEvent, DetectionDailyRollup, User
 
-__all__ = ["DetectionEvent", "User"]
+__all__ = ["DetectionEvent", "DetectionDailyRollup", "User"]
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, String, Float, DateTime, Index, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, DateTime, Date, Integer, Index, Enum
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime
 import uuid
 
 from app.core.database import Base
 
+EVENT_TYPES = ('DROWSY', 'YAWN')
+EMOTIONS = ('happy', 'frown', 'surprise', 'neutral')
+
+# Native PG enums: 4 bytes per value instead of a varchar
+event_type_enum = Enum(*EVENT_TYPES, name='detection_event_type')
+emotion_enum = Enum(*EMOTIONS, name='detection_emotion')
+
 
 class DetectionEvent(Base):
     __tablename__ = "detection_events"
@@ -12,21 +19,34 @@ class DetectionEvent(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     session_id = Column(UUID(as_uuid=True), nullable=False, index=True)
-    event_type = Column(String(20), nullable=False)  # DROWSY, YAWN
+    event_type = Column(event_type_enum, nullable=False)
     ear = Column(Float, nullable=True)
     mar = Column(Float, nullable=True)
-    emotion = Column(String(20), nullable=True)
+    emotion = Column(emotion_enum, nullable=True)
     confidence = Column(Float, nullable=True)
-    metadata = Column(Text, nullable=True)  # JSON string for additional data
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # "metadata" is reserved on declarative classes, so the attribute is renamed
+    event_metadata = Column("metadata", JSONB, nullable=True)
+    created_at = Column(DateTime, nullable=False)  # stamped per batch by EventBatcher
 
     __table_args__ = (
         Index('idx_user_time', 'user_id', 'created_at'),
         Index('idx_session_time', 'session_id', 'created_at'),
+        # Covers get_session_stats: counts per event_type without heap fetches
+        Index('idx_user_session_type', 'user_id', 'session_id', 'event_type'),
         Index('idx_event_type', 'event_type'),
     )
 
 
+class DetectionDailyRollup(Base):
+    """Per-user daily event counts, maintained by the event batcher"""
+    __tablename__ = "detection_daily_rollup"
+
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    date = Column(Date, primary_key=True)
+    event_type = Column(event_type_enum, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -1,3 +1,3 @@
-from app.services.event_service import EventService
+from app.services.event_service import EventService, event_batcher
 
-__all__ = ["EventService"]
+__all__ = ["EventService", "event_batcher"]
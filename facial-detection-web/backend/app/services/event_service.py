@@ -1,18 +1,168 @@
+import asyncio
+import logging
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional
-from uuid import UUID
-from sqlalchemy import select, func
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID, uuid4
+import orjson
+from sqlalchemy import select, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.event import DetectionEvent
+from app.core.config import settings
+from app.core.database import async_session_maker, EVENT_CHANNEL
+from app.models.event import DetectionEvent, DetectionDailyRollup, EMOTIONS
+
+logger = logging.getLogger(__name__)
+
+NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+class EventBatcher:
+    """Buffers detection events and writes them with one INSERT + commit per batch.
+
+    A batch is flushed when it reaches ``batch_size`` rows or ``batch_ms``
+    milliseconds after its first row arrived, whichever comes first.
+    """
+
+    def __init__(self, batch_size: int, batch_ms: int):
+        self.batch_size = batch_size
+        self.batch_ms = batch_ms
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # Events enqueued but not yet committed, per (user_id, session_id)
+        self.pending: Dict[Tuple[UUID, UUID], Dict[str, int]] = defaultdict(
+            lambda: {'DROWSY': 0, 'YAWN': 0}
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def enqueue(self, row: dict):
+        self.pending[(row['user_id'], row['session_id'])][row['event_type']] += 1
+        self.queue.put_nowait(row)
+
+    def pending_counts(self, user_id: UUID, session_id: UUID) -> Dict[str, int]:
+        return self.pending.get((user_id, session_id), {'DROWSY': 0, 'YAWN': 0})
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still queued and stop the background task."""
+        if self._task is None:
+            return
+        self.queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            row = await self.queue.get()
+            if row is None:
+                break
+            batch = [row]
+            deadline = loop.time() + self.batch_ms / 1000
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict]):
+        # One timestamp per batch: rows in a batch are at most batch_ms apart
+        now = datetime.utcnow()
+        for row in batch:
+            row['created_at'] = now
+        try:
+            await self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Failed to write detection event {batch[0]['id']}: {e}")
+                self._release(batch)
+                return
+            # Don't let one bad row drop everyone's events: retry row by row
+            logger.error(f"Failed to write {len(batch)} detection events, retrying one by one: {e}")
+            for row in batch:
+                try:
+                    await self._write([row])
+                except Exception as e:
+                    logger.error(f"Failed to write detection event {row['id']}: {e}")
+                    self._release([row])
+
+    async def _write(self, rows: list[dict]):
+        async with async_session_maker() as db:
+            # Core executemany: no ORM unit of work, no RETURNING (ids are client-side)
+            await db.execute(insert(DetectionEvent.__table__), rows)
+            await db.execute(self._rollup_upsert(rows))
+            # Delivered to listeners only when the transaction commits
+            await db.execute(NOTIFY, [
+                {'channel': EVENT_CHANNEL, 'payload': self._notify_payload(row)}
+                for row in rows
+            ])
+            await db.commit()
+            # Committed rows are already counted by stats queries; stop counting
+            # them as pending before the session close is awaited
+            self._release(rows)
+
+    def _release(self, batch: list[dict]):
+        for row in batch:
+            key = (row['user_id'], row['session_id'])
+            counts = self.pending[key]
+            counts[row['event_type']] -= 1
+            if not any(counts.values()):
+                del self.pending[key]
+
+    @staticmethod
+    def _notify_payload(row: dict) -> str:
+        return orjson.dumps({
+            'user_id': row['user_id'],
+            'session_id': row['session_id'],
+            'event_type': row['event_type'],
+        }).decode()
+
+    @staticmethod
+    def _rollup_upsert(batch: list[dict]):
+        counts: Dict[tuple, int] = defaultdict(int)
+        for row in batch:
+            counts[(row['user_id'], row['created_at'].date(), row['event_type'])] += 1
+
+        stmt = pg_insert(DetectionDailyRollup).values([
+            {'user_id': user_id, 'date': date, 'event_type': event_type, 'count': count}
+            for (user_id, date, event_type), count in counts.items()
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=['user_id', 'date', 'event_type'],
+            set_={'count': DetectionDailyRollup.count + stmt.excluded.count},
+        )
+
+
+event_batcher = EventBatcher(settings.EVENT_BATCH_SIZE, settings.EVENT_BATCH_MS)
+
+
+def _optional_float(name: str, value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    # bool is an int subclass; JSON true/false is not a measurement
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{name} must be a number")
+    return float(value)
 
 
 class EventService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def log_event(
-        self,
+    @staticmethod
+    def log_event(
         user_id: UUID,
         session_id: UUID,
         event_type: str,
@@ -20,45 +170,61 @@ class EventService:
         mar: Optional[float] = None,
         emotion: Optional[str] = None,
         confidence: Optional[float] = None,
-        metadata: Optional[str] = None,
-    ) -> DetectionEvent:
-        event = DetectionEvent(
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """Queue a detection event. Raises ValueError for fields the table would reject.
+
+        Needs no session: the row is written later by ``event_batcher``.
+
+        Values come straight from client JSON; a bad one must not reach the batch
+        insert, where it would fail the transaction for every queued event.
+        """
+        # An unknown emotion is dropped rather than rejected (the event itself is still valid)
+        if emotion not in EMOTIONS:
+            emotion = None
+        if metadata is not None and not isinstance(metadata, dict):
+            raise ValueError("metadata must be an object")
+
+        row = dict(
+            id=uuid4(),
             user_id=user_id,
             session_id=session_id,
             event_type=event_type,
-            ear=ear,
-            mar=mar,
+            ear=_optional_float('ear', ear),
+            mar=_optional_float('mar', mar),
             emotion=emotion,
-            confidence=confidence,
+            confidence=_optional_float('confidence', confidence),
             metadata=metadata,
-            created_at=datetime.utcnow(),
         )
-        self.db.add(event)
-        await self.db.flush()
-        return event
+        event_batcher.enqueue(row)
+        return row
 
     async def get_session_stats(
         self,
         user_id: UUID,
         session_id: UUID,
     ) -> dict:
-        # Get event counts for this session
+        # One row of filtered aggregates (served from idx_user_session_type)
         query = select(
-            DetectionEvent.event_type,
-            func.count(DetectionEvent.id).label('count'),
+            func.count().filter(DetectionEvent.event_type == 'DROWSY').label('drowsy'),
+            func.count().filter(DetectionEvent.event_type == 'YAWN').label('yawn'),
         ).where(
             DetectionEvent.user_id == user_id,
             DetectionEvent.session_id == session_id,
-        ).group_by(DetectionEvent.event_type)
+        )
 
-        result = await self.db.execute(query)
-        counts = {row.event_type: row.count for row in result}
+        drowsy, yawn = (await self.db.execute(query)).one()
+
+        # Include events that are still waiting in the batch queue
+        pending = event_batcher.pending_counts(user_id, session_id)
+        drowsy += pending['DROWSY']
+        yawn += pending['YAWN']
 
         return {
             'session_id': str(session_id),
-            'drowsy_count': counts.get('DROWSY', 0),
-            'yawn_count': counts.get('YAWN', 0),
-            'total_events': sum(counts.values()),
+            'drowsy_count': drowsy,
+            'yawn_count': yawn,
+            'total_events': drowsy + yawn,
         }
 
     async def get_user_stats(
@@ -66,34 +232,31 @@ class EventService:
         user_id: UUID,
         days: int = 7,
     ) -> dict:
-        since = datetime.utcnow() - timedelta(days=days)
+        since = (datetime.utcnow() - timedelta(days=days)).date()
 
         # Get daily event counts
         query = select(
-            func.date(DetectionEvent.created_at).label('date'),
-            DetectionEvent.event_type,
-            func.count(DetectionEvent.id).label('count'),
+            DetectionDailyRollup.date,
+            DetectionDailyRollup.event_type,
+            DetectionDailyRollup.count,
         ).where(
-            DetectionEvent.user_id == user_id,
-            DetectionEvent.created_at >= since,
-        ).group_by(
-            func.date(DetectionEvent.created_at),
-            DetectionEvent.event_type,
-        ).order_by(func.date(DetectionEvent.created_at))
+            DetectionDailyRollup.user_id == user_id,
+            DetectionDailyRollup.date >= since,
+        ).order_by(DetectionDailyRollup.date)
 
         result = await self.db.execute(query)
         rows = result.all()
 
         # Organize by date
         daily_stats = {}
-        for row in rows:
-            date_str = row.date.isoformat()
+        for date, event_type, count in rows:
+            date_str = date.isoformat()
             if date_str not in daily_stats:
                 daily_stats[date_str] = {'drowsy': 0, 'yawn': 0}
-            if row.event_type == 'DROWSY':
-                daily_stats[date_str]['drowsy'] = row.count
-            elif row.event_type == 'YAWN':
-                daily_stats[date_str]['yawn'] = row.count
+            if event_type == 'DROWSY':
+                daily_stats[date_str]['drowsy'] = count
+            elif event_type == 'YAWN':
+                daily_stats[date_str]['yawn'] = count
 
         return {
             'user_id': str(user_id),
@@ -9,13 +9,25 @@ import numpy as np
 import mediapipe as mp
 from mediapipe.tasks import python as mp_python
 from mediapipe.tasks.python import vision
+import functools
+import math
+import operator
 import os
+import queue
 import subprocess
+import threading
 import time
 import stat
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
 from datetime import datetime
 
+try:
+    from numba import njit  # 선택 사항: pip install numba (EAR/MAR JIT 커널)
+except ImportError:
+    njit = None
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # 로그 설정
@@ -29,7 +41,7 @@ logger.setLevel(logging.DEBUG)
 # 포맷터
 formatter = logging.Formatter('%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s', datefmt='%H:%M:%S')
 
-# 파일 핸들러 (즉시 쓰기를 위해 open으로 직접 생성)
+# 파일 핸들러
 file_handler = logging.FileHandler(LOG_FILE, mode='a')
 file_handler.setLevel(logging.DEBUG)
 file_handler.setFormatter(formatter)
@@ -39,18 +51,16 @@ stream_handler = logging.StreamHandler()
 stream_handler.setLevel(logging.DEBUG)
 stream_handler.setFormatter(formatter)
 
-# 핸들러 추가
-logger.addHandler(file_handler)
-logger.addHandler(stream_handler)
-
-# 로그 즉시 기록을 위한 래퍼 함수
-_original_handle = logger.handle
-def _flush_handle(record):
-    _original_handle(record)
-    file_handler.flush()
-logger.handle = _flush_handle
+# 실제 파일/콘솔 쓰기는 백그라운드 스레드에서 (메인 루프는 큐에 넣기만 함)
+# 기록마다 flush하므로 로그는 바로 파일에 남음
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+logger.addHandler(QueueHandler(log_queue))
+log_listener.start()
 
 # Named Pipe 경로
+# 프레임 규약: 이벤트는 "DROWSY\n", "YAWN\n"처럼 줄바꿈으로 구분하고,
+# 한 번의 write()에 여러 이벤트를 담을 수 있음 (PIPE_BUF 4KB 이하로 원자적 쓰기)
 PIPE_PATH = "/tmp/face_status_pipe"
 
 # 설정값
@@ -61,15 +71,44 @@ JAW_OPEN_SCORE_THRESHOLD = 0.35  # 블렌드셰이프 jawOpen 스코어 임계
 DROWSY_TIME = 2.0             # 졸림 판단 시간 (초)
 YAWN_TIME = 1.0               # 하품 판단 시간 (초)
 ALERT_COOLDOWN = 3.0          # 경고음 재생 간격 (초)
+# 타이머는 time.monotonic_ns() 정수(ns)로 비교 (시계 변경에 영향 없음)
+NS_PER_SEC = 1_000_000_000
+DROWSY_TIME_NS = int(DROWSY_TIME * NS_PER_SEC)
+YAWN_TIME_NS = int(YAWN_TIME * NS_PER_SEC)
+ALERT_COOLDOWN_NS = int(ALERT_COOLDOWN * NS_PER_SEC)
 BLENDSHAPE_TOP_K = 3          # 화면에 표시할 상위 블렌드셰이프 개수
+EMOTION_INTERVAL = 5          # 표정/상위 블렌드셰이프 갱신 주기 (프레임, 졸림 판단은 매 프레임)
+CAMERA_WIDTH = 640            # 카메라 캡처 해상도
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+DETECTION_SCALE = 0.5         # 감지 입력 축소 비율 (얼굴이 멀어 인식이 불안정하면 1.0으로)
+DETECTION_INTERVAL = 2        # 얼굴 감지를 실행할 프레임 간격 (졸림/하품 판정은 초 단위라 영향 없음)
+STATIC_THUMB_SIZE = (16, 16)  # 정지 프레임 판단용 썸네일 크기
+STATIC_FRAME_DIFF = 2.0       # 썸네일 픽셀 평균 차이가 이보다 작으면 정지 프레임으로 판단 (0~255)
+STATIC_FRAME_MAX_REUSE = 2    # 정지 프레임에서 감지 결과를 연속 재사용할 최대 프레임 수
+EVENT_QUEUE_SIZE = 64         # 파이프 전송 대기 이벤트 최대 개수
+FRAME_QUEUE_SIZE = 2          # 캡처 스레드 → 감지 사이 대기 프레임 수 (가득 차면 오래된 프레임 버림)
+WINDOW_CHECK_INTERVAL = 10    # 창 닫힘 확인 주기 (프레임)
+
+# MediaPipe Face Landmarker 신뢰도 (VIDEO 모드)
+# 추적 신뢰도가 기준 이상이면 이전 프레임의 얼굴 영역을 그대로 쓰고 얼굴 검출기는 건너뜀
+# 추적에 실패했을 때만 다음 프레임에서 얼굴 검출을 다시 실행
+FACE_DETECTION_CONFIDENCE = 0.5
+FACE_PRESENCE_CONFIDENCE = 0.5
+FACE_TRACKING_CONFIDENCE = 0.5
+USE_GPU_DELEGATE = True  # 얼굴 랜드마크 추론을 GPU에서 실행 (실패 시 CPU)
+
+# 경고음
+ALERT_SOUND_PATH = "/System/Library/Sounds/Sosumi.aiff"
 
 # MediaPipe 모델 경로
 MODELS_DIR = os.path.join(SCRIPT_DIR, "models")
 FACE_LANDMARKER_MODEL = os.path.join(MODELS_DIR, "face_landmarker.task")
 
 # MediaPipe Face Landmarker에서 사용할 주요 랜드마크 인덱스
-LEFT_EYE_INDICES = [33, 160, 158, 133, 153, 144]
-RIGHT_EYE_INDICES = [362, 385, 387, 263, 373, 380]
+# (NumPy 인덱스 배열로 한 번만 만들어 두고 fancy indexing에 그대로 사용)
+LEFT_EYE_INDICES = np.array([33, 160, 158, 133, 153, 144], dtype=np.intp)
+RIGHT_EYE_INDICES = np.array([362, 385, 387, 263, 373, 380], dtype=np.intp)
 MOUTH_INDICES = {
     "left": 61,
     "right": 291,
@@ -80,10 +119,49 @@ MOUTH_INDICES = {
     "lower_left": 178,
     "lower_right": 402,
 }
-
-
-def euclidean_distance(p1, p2):
-    return float(np.linalg.norm(p1 - p2))
+# 입 윤곽 그리기 순서 (매 프레임 점 목록을 새로 만들지 않도록 미리 계산)
+MOUTH_POLY_INDICES = np.array([
+    MOUTH_INDICES[name]
+    for name in ("left", "upper_left", "upper", "upper_right", "right", "lower_right", "lower", "lower_left")
+], dtype=np.intp)
+
+# 화면에 윤곽선으로 그릴 점 목록 (왼쪽 눈, 오른쪽 눈, 입)
+OUTLINE_INDICES = (LEFT_EYE_INDICES, RIGHT_EYE_INDICES, MOUTH_POLY_INDICES)
+
+# 졸림/표정 판단에 쓰는 blendshape 이름
+# (점수 배열에서의 위치는 첫 감지 결과의 category_name으로 찾음 - BlendshapeIndex)
+BLINK_BLENDSHAPES = ("eyeBlinkLeft", "eyeBlinkRight")
+EMOTION_BLENDSHAPES = (
+    "mouthSmileLeft", "mouthSmileRight",
+    "mouthFrownLeft", "mouthFrownRight", "browDownLeft", "browDownRight",
+    "jawOpen", "eyeWideLeft", "eyeWideRight",
+    "mouthClose",
+)
+
+# 상태 패널 영역 (화면 왼쪽 상단)
+PANEL_X0, PANEL_Y0, PANEL_X1, PANEL_Y1 = 10, 10, 341, 331
+STATE_Y0, STATE_Y1 = 126, 204  # 눈/졸림/하품 상태 문구 영역
+EMOTION_Y0 = 224  # 표정 결과 영역 시작 (패널 안, "=== Emotion ===" 제목 아래)
+
+# 상태 패널 수치 줄: (y 위치, 형식, 비교 함수, 임계값) - 비교가 참이면 빨간색
+STATUS_ROWS = (
+    (60, f"EAR: {{:.2f}} (< {EAR_THRESHOLD})", operator.lt, EAR_THRESHOLD),
+    (80, f"MAR: {{:.2f}} (> {MAR_THRESHOLD})", operator.gt, MAR_THRESHOLD),
+    (100, f"Blink: {{:.2f}} (> {BLINK_SCORE_THRESHOLD})", operator.ge, BLINK_SCORE_THRESHOLD),
+    (120, f"JawOpen: {{:.2f}} (> {JAW_OPEN_SCORE_THRESHOLD})", operator.ge, JAW_OPEN_SCORE_THRESHOLD),
+)
+
+# 경고 문구 (크기는 한 번만 계산)
+WAKE_UP_TEXT = "Wake up!"
+WAKE_UP_SIZE = cv2.getTextSize(WAKE_UP_TEXT, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
+
+
+# EAR/MAR 거리 계산에 쓰는 점 쌍 (한 번의 norm 호출로 계산)
+EYE_PAIRS = (np.array([1, 2, 0], dtype=np.intp), np.array([5, 4, 3], dtype=np.intp))  # 세로 2개 + 가로 1개
+MOUTH_PAIRS = (
+    np.array([MOUTH_INDICES[k] for k in ("upper", "upper_left", "upper_right", "left")], dtype=np.intp),
+    np.array([MOUTH_INDICES[k] for k in ("lower", "lower_left", "lower_right", "right")], dtype=np.intp),
+)  # 세로 3개 + 가로 1개
 
 
 def eye_aspect_ratio(eye_points):
@@ -91,98 +169,274 @@ def eye_aspect_ratio(eye_points):
     EAR (Eye Aspect Ratio) 계산
     눈의 세로/가로 비율로 눈 감김 정도 측정
     """
-    A = euclidean_distance(eye_points[1], eye_points[5])
-    B = euclidean_distance(eye_points[2], eye_points[4])
-    C = euclidean_distance(eye_points[0], eye_points[3])
+    A, B, C = np.linalg.norm(eye_points[EYE_PAIRS[0]] - eye_points[EYE_PAIRS[1]], axis=1)
     if C == 0:
         return 0.0
-    return (A + B) / (2.0 * C)
+    return float((A + B) / (2.0 * C))
 
 
-def mouth_aspect_ratio(mouth_points):
+def mouth_aspect_ratio(landmarks):
     """
     MAR (Mouth Aspect Ratio) 계산
     MediaPipe 얼굴 랜드마크로 하품 감지
     """
-    A = euclidean_distance(mouth_points["upper"], mouth_points["lower"])
-    B = euclidean_distance(mouth_points["upper_left"], mouth_points["lower_left"])
-    C = euclidean_distance(mouth_points["upper_right"], mouth_points["lower_right"])
-    D = euclidean_distance(mouth_points["left"], mouth_points["right"])
+    A, B, C, D = np.linalg.norm(landmarks[MOUTH_PAIRS[0]] - landmarks[MOUTH_PAIRS[1]], axis=1)
     if D == 0:
         return 0.0
-    return (A + B + C) / (3.0 * D)
+    return float((A + B + C) / (3.0 * D))
+
+
+def _distance(landmarks, i, j):
+    dx = landmarks[i, 0] - landmarks[j, 0]
+    dy = landmarks[i, 1] - landmarks[j, 1]
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def _ear_mar_kernel(landmarks):
+    """
+    양쪽 눈 EAR 평균과 MAR을 한 번에 계산 (numba JIT용)
+    인덱스는 LEFT_EYE_INDICES / RIGHT_EYE_INDICES / MOUTH_INDICES와 동일
+    """
+    left_w = _distance(landmarks, 33, 133)
+    left_ear = 0.0
+    if left_w > 0:
+        left_ear = (_distance(landmarks, 160, 144) + _distance(landmarks, 158, 153)) / (2.0 * left_w)
+
+    right_w = _distance(landmarks, 362, 263)
+    right_ear = 0.0
+    if right_w > 0:
+        right_ear = (_distance(landmarks, 385, 380) + _distance(landmarks, 387, 373)) / (2.0 * right_w)
+
+    mouth_w = _distance(landmarks, 61, 291)
+    mar = 0.0
+    if mouth_w > 0:
+        mar = (
+            _distance(landmarks, 13, 14) + _distance(landmarks, 81, 178) + _distance(landmarks, 311, 402)
+        ) / (3.0 * mouth_w)
+
+    return (left_ear + right_ear) / 2.0, mar
+
+
+def _ear_mar_numpy(landmarks):
+    left_ear = eye_aspect_ratio(landmarks[LEFT_EYE_INDICES])
+    right_ear = eye_aspect_ratio(landmarks[RIGHT_EYE_INDICES])
+    return (left_ear + right_ear) / 2.0, mouth_aspect_ratio(landmarks)
+
+
+# ear_mar(landmarks) -> (EAR 평균, MAR): numba가 있으면 JIT 커널, 없으면 NumPy 버전
+if njit is not None:
+    _distance = njit(cache=True, fastmath=True)(_distance)
+    ear_mar = njit(cache=True, fastmath=True)(_ear_mar_kernel)
+else:
+    ear_mar = _ear_mar_numpy
 
 
 def to_pixel_landmarks(face_landmarks, image_shape):
-    """정규화된 MediaPipe 랜드마크를 픽셀 좌표 dict로 변환"""
+    """정규화된 MediaPipe 랜드마크를 픽셀 좌표 배열 (N, 2)로 변환"""
     height, width = image_shape[:2]
-    return {
-        idx: np.array([lm.x * width, lm.y * height], dtype=np.float32)
-        for idx, lm in enumerate(face_landmarks)
-    }
+    points = np.fromiter(
+        (v for lm in face_landmarks for v in (lm.x, lm.y)),
+        dtype=np.float32, count=len(face_landmarks) * 2,
+    ).reshape(-1, 2)
+    points *= (width, height)
+    return points
 
 
 def load_face_landmarker(model_path):
-    """MediaPipe Face Landmarker 모델 로드"""
-    options = vision.FaceLandmarkerOptions(
-        base_options=mp_python.BaseOptions(model_asset_path=model_path),
-        output_face_blendshapes=True,
-        num_faces=1,
-        running_mode=vision.RunningMode.VIDEO,
-    )
-    return vision.FaceLandmarker.create_from_options(options)
-
-
-def build_blendshape_map(result):
-    """blendshape 결과를 dict로 변환"""
+    """
+    MediaPipe Face Landmarker 모델 로드
+    GPU delegate(macOS: Metal)를 먼저 시도하고, 생성이나 시험 감지에 실패하면 CPU로 로드
+    """
+    def create(delegate):
+        options = vision.FaceLandmarkerOptions(
+            base_options=mp_python.BaseOptions(model_asset_path=model_path, delegate=delegate),
+            output_face_blendshapes=True,
+            num_faces=1,
+            running_mode=vision.RunningMode.VIDEO,
+            min_face_detection_confidence=FACE_DETECTION_CONFIDENCE,
+            min_face_presence_confidence=FACE_PRESENCE_CONFIDENCE,
+            min_tracking_confidence=FACE_TRACKING_CONFIDENCE,
+        )
+        return vision.FaceLandmarker.create_from_options(options)
+
+    if USE_GPU_DELEGATE:
+        landmarker = None
+        try:
+            landmarker = create(mp_python.BaseOptions.Delegate.GPU)
+            # 생성은 되어도 첫 감지에서 실패할 수 있으므로 (예: GPU에서 SRGB 입력 거부)
+            # 실제 입력과 같은 형식의 빈 프레임으로 한 번 감지해 보고 사용
+            dummy = np.zeros((int(CAMERA_HEIGHT * DETECTION_SCALE), int(CAMERA_WIDTH * DETECTION_SCALE), 3),
+                             dtype=np.uint8)
+            landmarker.detect_for_video(mp.Image(image_format=mp.ImageFormat.SRGB, data=dummy), 0)
+            logger.info("GPU delegate 사용")
+            return landmarker
+        except Exception as e:
+            logger.warning(f"GPU delegate 사용 불가 - CPU로 실행: {e}")
+            if landmarker is not None:
+                landmarker.close()
+    return create(mp_python.BaseOptions.Delegate.CPU)
+
+
+def blendshape_categories(result):
+    """첫 번째 얼굴의 blendshape 목록 (없으면 None)"""
     if not result.face_blendshapes:
-        return {}
+        return None
     first = result.face_blendshapes[0]
-    categories = first.categories if hasattr(first, "categories") else first
-    return {c.category_name: c.score for c in categories}
+    return first.categories if hasattr(first, "categories") else first
+
+
+class BlendshapeIndex:
+    """
+    blendshape 이름 -> 점수 배열 위치
+    첫 감지 결과의 category_name으로 한 번만 만들고, 이후 프레임은 위치로 바로 꺼냄
+    (모델 파일이 바뀌어 순서가 달라져도 이름으로 찾으므로 안전, 필요한 이름이 없으면 KeyError)
+    """
+
+    def __init__(self, categories):
+        self.names = tuple(c.category_name for c in categories)
+        index = {name: i for i, name in enumerate(self.names)}
+        self.blink = np.array([index[name] for name in BLINK_BLENDSHAPES], dtype=np.intp)
+        self.jaw_open = index["jawOpen"]
+        self.emotion = np.array([index[name] for name in EMOTION_BLENDSHAPES], dtype=np.intp)
 
 
-def summarize_emotion(blendshape_scores):
+def build_blendshape_scores(categories):
+    """blendshape 점수를 결과 순서 그대로 float32 배열로 변환"""
+    return np.fromiter((c.score for c in categories), dtype=np.float32, count=len(categories))
+
+
+def summarize_emotion(blendshape_scores, blendshape_index):
     """
     주요 표정 신호를 단순 매핑 (happy/frown/surprise/neutral)
     MediaPipe blendshape 조합을 간략한 레이블로 변환
     """
-    smile = np.mean([
-        blendshape_scores.get("mouthSmileLeft", 0.0),
-        blendshape_scores.get("mouthSmileRight", 0.0),
-    ])
-    frown = np.mean([
-        blendshape_scores.get("mouthFrownLeft", 0.0),
-        blendshape_scores.get("mouthFrownRight", 0.0),
-        blendshape_scores.get("browDownLeft", 0.0),
-        blendshape_scores.get("browDownRight", 0.0),
-    ])
-    surprise = np.mean([
-        blendshape_scores.get("jawOpen", 0.0),
-        blendshape_scores.get("eyeWideLeft", 0.0),
-        blendshape_scores.get("eyeWideRight", 0.0),
-    ])
-    neutral = blendshape_scores.get("mouthClose", 0.0)
-
+    # 필요한 점수 10개를 한 번에 꺼내서 파이썬 float로 계산 (작은 배열에 np.mean을 쓰지 않음)
+    (smile_l, smile_r, frown_l, frown_r, brow_down_l, brow_down_r,
+     jaw_open, eye_wide_l, eye_wide_r, mouth_close) = blendshape_scores[blendshape_index.emotion].tolist()
     scores = {
-        "happy": smile,
-        "frown": frown,
-        "surprise": surprise,
-        "neutral": neutral,
+        "happy": (smile_l + smile_r) * 0.5,
+        "frown": (frown_l + frown_r + brow_down_l + brow_down_r) * 0.25,
+        "surprise": (jaw_open + eye_wide_l + eye_wide_r) / 3,
+        "neutral": mouth_close,
     }
     label = max(scores, key=scores.get)
     return label, scores[label]
 
 
-def play_alert_sound():
-    """macOS 시스템 경고음 재생"""
+def load_alert_sound():
+    """
+    경고음을 NSSound로 미리 로드 (PyObjC AppKit 필요)
+    없으면 None을 반환하고 afplay로 재생
+    """
+    try:
+        from AppKit import NSSound
+    except ImportError:
+        logger.debug("AppKit 모듈 없음 - afplay로 경고음 재생")
+        return None
+    return NSSound.alloc().initWithContentsOfFile_byReference_(ALERT_SOUND_PATH, True)
+
+
+def play_alert_sound(sound=None):
+    """macOS 시스템 경고음 재생 (NSSound가 있으면 프로세스를 새로 띄우지 않음)"""
+    if sound is not None:
+        sound.stop()  # 재생 중이면 처음부터 다시
+        sound.play()  # 비동기 재생, 바로 반환
+        return
     subprocess.Popen(
-        ['afplay', '/System/Library/Sounds/Sosumi.aiff'],
+        ['afplay', ALERT_SOUND_PATH],
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL
     )
 
 
+class TextOverlay:
+    """
+    미리 그려 둔 글자를 매 프레임 ROI에 합성 (글자를 매번 다시 그리지 않음)
+    color: 검은 배경에 그린 글자 (= 글자색 * 커버리지, 안티에일리어싱 가장자리 포함)
+    inv_alpha: 글자 밖을 얼마나 남길지 (255 - 커버리지) * background
+    합성: roi = roi * inv_alpha / 255 + color  (배경 위에 putText한 결과와 같음)
+    """
+
+    def __init__(self, height, width):
+        self.color = np.zeros((height, width, 3), dtype=np.uint8)
+        self.coverage = np.zeros((height, width), dtype=np.uint8)
+        self.inv_alpha = None
+
+    def put_text(self, text, org, scale, color, thickness):
+        cv2.putText(self.color, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        cv2.putText(self.coverage, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+
+    def finish(self, background=1.0):
+        """글자를 다 그린 뒤 호출 (background: 글자 밖 ROI 밝기 배율, 반투명 패널은 0.4)"""
+        inv_alpha = np.rint((255 - self.coverage.astype(np.float32)) * background).astype(np.uint8)
+        self.inv_alpha = cv2.merge((inv_alpha, inv_alpha, inv_alpha))
+        return self
+
+    def paste(self, roi):
+        cv2.multiply(roi, self.inv_alpha, dst=roi, scale=1 / 255)
+        cv2.add(roi, self.color, dst=roi)
+
+
+def build_status_panel():
+    """
+    상태 패널 오버레이 생성 (40% 밝기의 반투명 검은 배경 + 고정 제목)
+    매 프레임 패널 영역에 한 번의 합성으로 적용
+    """
+    panel = TextOverlay(PANEL_Y1 - PANEL_Y0, PANEL_X1 - PANEL_X0)
+    for title, y_pos in (("=== Status ===", 35), ("=== Emotion ===", 220)):
+        panel.put_text(title, (20 - PANEL_X0, y_pos - PANEL_Y0), 0.55, (255, 255, 255), 2)
+    return panel.finish(background=0.4)
+
+
+@functools.lru_cache(maxsize=None)
+def render_state_sprite(eyes_open, is_drowsy, is_yawning):
+    """
+    눈/졸림/하품 상태 문구를 오버레이로 그림 (조합 8가지, 처음 쓸 때 한 번만 그림)
+    매 프레임 TextOverlay.paste로 합성
+    """
+    sprite = TextOverlay(STATE_Y1 - STATE_Y0, PANEL_X1 - PANEL_X0)
+    origin_x, origin_y = 20 - PANEL_X0, -STATE_Y0
+
+    if eyes_open:
+        sprite.put_text("Eyes: Open", (origin_x, origin_y + 140), 0.45, (200, 200, 200), 1)
+
+    if is_drowsy:
+        sprite.put_text("DROWSY!", (origin_x, origin_y + 165), 0.6, (0, 0, 255), 2)
+    else:
+        sprite.put_text("Drowsy: No", (origin_x, origin_y + 165), 0.45, (0, 255, 0), 1)
+
+    if is_yawning:
+        sprite.put_text("YAWNING!", (origin_x, origin_y + 190), 0.6, (0, 165, 255), 2)
+    else:
+        sprite.put_text("Yawn: No", (origin_x, origin_y + 190), 0.45, (0, 255, 0), 1)
+
+    return sprite.finish()
+
+
+def render_emotion_sprite(emotion_result, top_blendshapes):
+    """
+    표정 결과 글자를 패널 아래쪽 크기의 오버레이로 그림
+    매 프레임 TextOverlay.paste로 합성
+    """
+    sprite = TextOverlay(PANEL_Y1 - EMOTION_Y0, PANEL_X1 - PANEL_X0)
+    origin_x, origin_y = 20 - PANEL_X0, -EMOTION_Y0
+    y_pos = 220  # "=== Emotion ===" (패널)
+
+    if emotion_result:
+        label, confidence = emotion_result
+        y_pos += 25
+        color = (0, 255, 0) if confidence > 0.5 else (0, 255, 255)
+        sprite.put_text(f"{label}: {confidence*100:.1f}%", (origin_x, origin_y + y_pos), 0.55, color, 2)
+    if top_blendshapes:
+        y_pos += 22
+        sprite.put_text("Top blendshapes:", (origin_x, origin_y + y_pos), 0.45, (200, 200, 200), 1)
+        for name, score in top_blendshapes:
+            y_pos += 18
+            sprite.put_text(f"- {name}: {score:.2f}", (origin_x, origin_y + y_pos), 0.4, (160, 160, 160), 1)
+
+    return sprite.finish()
+
+
 def find_builtin_camera():
     """
     맥북 빌트인 카메라를 찾아 인덱스 반환
@@ -229,6 +483,62 @@ def find_builtin_camera():
         return 0
 
 
+class FrameReader:
+    """
+    카메라 캡처 + 좌우 반전을 별도 스레드에서 수행
+    감지/표시가 느려지면 오래된 프레임을 버려서 지연이 쌓이지 않음
+    (감지 상태와 화면 표시는 메인 스레드에서만 다룸 - macOS는 GUI를 메인 스레드에서만 허용)
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.frames = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self.free = queue.SimpleQueue()  # 다 쓴 프레임 버퍼 (다시 캡처에 사용)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="FrameReader", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        raw = None
+        while not self.stopped.is_set():
+            ret, raw = self.cap.read(raw)  # 같은 버퍼에 계속 읽기
+            if not ret:
+                self._put(None)  # 카메라 끊김 알림
+                break
+            try:
+                buffer = self.free.get_nowait()
+            except queue.Empty:
+                buffer = None  # 쓸 수 있는 버퍼가 없으면 새로 할당
+            self._put(cv2.flip(raw, 1, dst=buffer))  # 좌우 반전 (거울 모드)
+
+    def _put(self, frame):
+        while True:
+            try:
+                self.frames.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    self.release(self.frames.get_nowait())  # 가장 오래된 프레임 버림
+                except queue.Empty:
+                    pass
+
+    def read(self):
+        """다음 프레임 (카메라가 끊기면 None)"""
+        return self.frames.get()
+
+    def release(self, frame):
+        """처리가 끝난 프레임 버퍼 반환 (다음 캡처에 재사용)"""
+        if frame is not None:
+            self.free.put(frame)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=1.0)
+
+
 def setup_pipe():
     """Named Pipe 생성"""
     if os.path.exists(PIPE_PATH):
@@ -245,23 +555,65 @@ def try_connect_pipe():
         return None
 
 
-def send_event(pipe_fd, event_type):
-    """파이프로 이벤트 전송 (non-blocking), 연결 안 됐으면 재시도"""
-    # 연결 안 됐으면 재시도
-    if pipe_fd is None:
-        pipe_fd = try_connect_pipe()
-        if pipe_fd is not None:
-            logger.info("파이프 연결됨 (외부 수신자 감지)")
+class EventWriter:
+    """
+    파이프 쓰기를 별도 스레드에서 처리 (감지 루프에서 write/open 시스템 콜 제거)
+    쌓인 이벤트는 write() 한 번으로 묶어서 보냄, 수신자 재연결도 이 스레드에서 시도
+    """
 
-    if pipe_fd is None:
-        return pipe_fd
+    def __init__(self):
+        self.events = deque(maxlen=EVENT_QUEUE_SIZE)  # 쓰기가 밀리면 오래된 이벤트부터 버림
+        self.cond = threading.Condition()
+        self.stopped = False
+        self.pipe_fd = try_connect_pipe()
+        if self.pipe_fd is not None:
+            logger.info("파이프 연결됨 (외부 수신자 있음)")
+        else:
+            logger.debug("파이프 수신자 없음 - 이벤트 전송 비활성화")
+        self.thread = threading.Thread(target=self._run, name="EventWriter", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def send(self, events):
+        """이벤트 전송 예약 (바로 반환)"""
+        with self.cond:
+            self.events.extend(events)
+            self.cond.notify()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.events and not self.stopped:
+                    self.cond.wait()
+                if not self.events:
+                    return
+                events = list(self.events)
+                self.events.clear()
+            self._write(events)
+
+    def _write(self, events):
+        # 연결 안 됐으면 재시도
+        if self.pipe_fd is None:
+            self.pipe_fd = try_connect_pipe()
+            if self.pipe_fd is None:
+                return
+            logger.info("파이프 연결됨 (외부 수신자 감지)")
 
-    try:
-        os.write(pipe_fd, f"{event_type}\n".encode())
-    except (BrokenPipeError, BlockingIOError, OSError):
-        pass  # 수신자가 없거나 버퍼가 찼으면 무시
+        try:
+            os.write(self.pipe_fd, "".join(f"{event_type}\n" for event_type in events).encode())
+        except (BrokenPipeError, BlockingIOError, OSError):
+            pass  # 수신자가 없거나 버퍼가 찼으면 무시
 
-    return pipe_fd
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify()
+        self.thread.join(timeout=1.0)
+        if self.pipe_fd is not None:
+            os.close(self.pipe_fd)
+            self.pipe_fd = None
 
 
 def main():
@@ -278,12 +630,17 @@ def main():
     # 초기화
     logger.info("MediaPipe Face Landmarker 로딩 중...")
     landmarker = load_face_landmarker(FACE_LANDMARKER_MODEL)
+    alert_sound = load_alert_sound()
+    if njit is not None:
+        # numba JIT 컴파일을 캡처 시작 전에 끝내 둠 (첫 프레임 지연 방지)
+        ear_mar(np.zeros((478, 2), dtype=np.float32))
+    status_panel = build_status_panel()
     logger.info("모델 로딩 완료!")
 
     # 졸림/하품 감지용 시간 기반 변수
-    eye_closed_start = None  # 눈 감기 시작 시간
-    yawn_start = None        # 하품 시작 시간
-    last_alert_time = 0      # 마지막 경고음 시간
+    eye_closed_start = None  # 눈 감기 시작 시간 (ns)
+    yawn_start = None        # 하품 시작 시간 (ns)
+    last_alert_time = time.monotonic_ns() - ALERT_COOLDOWN_NS  # 마지막 경고음 시간 (ns)
     is_drowsy = False        # 졸림 상태
     is_yawning = False       # 하품 상태
     current_ear = 0.0        # 현재 EAR 값
@@ -295,12 +652,7 @@ def main():
 
     # Named Pipe 설정 (non-blocking 쓰기 모드)
     setup_pipe()
-    try:
-        pipe_fd = os.open(PIPE_PATH, os.O_WRONLY | os.O_NONBLOCK)
-        logger.info("파이프 연결됨 (외부 수신자 있음)")
-    except OSError:
-        pipe_fd = None
-        logger.debug("파이프 수신자 없음 - 이벤트 전송 비활성화")
+    event_writer = EventWriter().start()
 
     # 카메라 시작 (빌트인 카메라 우선)
     camera_index = find_builtin_camera()
@@ -312,10 +664,15 @@ def main():
         logger.error("macOS 시스템 설정 > 개인정보 보호 및 보안 > 카메라에서 터미널 접근을 허용해주세요.")
         return
 
-    # 카메라 설정
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
+    # 카메라 설정 (필요 이상으로 큰 프레임을 받지 않도록 명시)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # 드라이버에 오래된 프레임이 쌓이지 않도록
+    logger.debug(
+        f"카메라 설정값: {cap.get(cv2.CAP_PROP_FRAME_WIDTH):.0f}x{cap.get(cv2.CAP_PROP_FRAME_HEIGHT):.0f} "
+        f"@ {cap.get(cv2.CAP_PROP_FPS):.0f}fps"
+    )
 
     # 카메라 워밍업 (첫 프레임 안정화 대기)
     logger.info("카메라 초기화 중...")
@@ -341,18 +698,44 @@ def main():
     cv2.resizeWindow(window_name, 640, 480)
 
     frame_count = 0
+    small_frame = None  # 감지용 축소 프레임 버퍼
+    rgb_frame = None    # 감지용 RGB 버퍼
+    thumb = None        # 정지 프레임 비교용 썸네일 (현재 / 마지막 감지 프레임)
+    last_thumb = None
+    result = None       # 마지막 감지 결과
+    reuse_count = 0     # 감지 결과를 연속으로 재사용한 프레임 수
+    points = None       # 랜드마크 정수 좌표 버퍼
+    outlines = [np.empty((len(indices), 2), dtype=np.int32) for indices in OUTLINE_INDICES]  # 눈/입 윤곽선 점
+    last_emotion_key = None  # 표정 스프라이트를 마지막으로 그린 결과
+    blendshape_index = None  # blendshape 이름 -> 위치 (첫 감지 결과로 만듦)
+    reader = FrameReader(cap).start()
 
     while True:
-        ret, frame = cap.read()
-        if not ret:
+        frame = reader.read()
+        if frame is None:
             logger.error("프레임을 읽을 수 없습니다.")
             break
-
-        # 좌우 반전 (거울 모드)
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-        result = landmarker.detect_for_video(mp_image, int(time.time() * 1000))
+        current_time = time.monotonic_ns()  # 이번 프레임 시각 (프레임당 한 번만 읽음)
+
+        # 축소한 프레임으로 감지 (랜드마크는 정규화 좌표라 원본 크기로 그대로 환산됨)
+        # (첫 프레임 이후에는 같은 버퍼에 덮어씀)
+        small_frame = cv2.resize(frame, None, dst=small_frame, fx=DETECTION_SCALE, fy=DETECTION_SCALE,
+                                 interpolation=cv2.INTER_AREA)
+
+        # 감지는 DETECTION_INTERVAL 프레임마다 한 번, 사이 프레임은 직전 감지 결과 재사용
+        # 직전 감지 프레임과 거의 같으면 (가만히 있을 때) 주기가 돌아와도 재사용
+        # 눈을 천천히 감는 변화를 놓치지 않도록 연속 재사용은 STATIC_FRAME_MAX_REUSE 프레임까지
+        thumb = cv2.resize(small_frame, STATIC_THUMB_SIZE, dst=thumb, interpolation=cv2.INTER_AREA)
+        if (result is not None and reuse_count < STATIC_FRAME_MAX_REUSE
+                and (reuse_count < DETECTION_INTERVAL - 1
+                     or cv2.norm(thumb, last_thumb, cv2.NORM_L1) < STATIC_FRAME_DIFF * thumb.size)):
+            reuse_count += 1
+        else:
+            rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+            result = landmarker.detect_for_video(mp_image, current_time // 1_000_000)
+            thumb, last_thumb = last_thumb, thumb  # 비교 기준을 이번 감지 프레임으로
+            reuse_count = 0
 
         faces = result.face_landmarks if result else []
 
@@ -360,22 +743,20 @@ def main():
             face_landmarks = faces[0]
             pixel_landmarks = to_pixel_landmarks(face_landmarks, frame.shape)
 
-            left_eye = np.array([pixel_landmarks[i] for i in LEFT_EYE_INDICES], dtype=np.float32)
-            right_eye = np.array([pixel_landmarks[i] for i in RIGHT_EYE_INDICES], dtype=np.float32)
-            mouth_points = {name: pixel_landmarks[idx] for name, idx in MOUTH_INDICES.items()}
-
             # EAR/MAR 계산
-            left_ear = eye_aspect_ratio(left_eye)
-            right_ear = eye_aspect_ratio(right_eye)
-            current_ear = (left_ear + right_ear) / 2.0
-            current_mar = mouth_aspect_ratio(mouth_points)
-
-            blendshape_scores = build_blendshape_map(result)
-            blink_score = np.mean([
-                blendshape_scores.get("eyeBlinkLeft", 0.0),
-                blendshape_scores.get("eyeBlinkRight", 0.0),
-            ])
-            jaw_open_score = blendshape_scores.get("jawOpen", 0.0)
+            current_ear, current_mar = ear_mar(pixel_landmarks)
+
+            categories = blendshape_categories(result)
+            if categories is not None:
+                if blendshape_index is None:
+                    blendshape_index = BlendshapeIndex(categories)
+                blendshape_scores = build_blendshape_scores(categories)
+                blink_left, blink_right = blendshape_scores[blendshape_index.blink].tolist()
+                blink_score = (blink_left + blink_right) * 0.5
+                jaw_open_score = float(blendshape_scores[blendshape_index.jaw_open])
+            else:
+                blink_score = 0.0
+                jaw_open_score = 0.0
 
             # 간헐적 디버그 로그
             if frame_count % 10 == 0:
@@ -386,34 +767,29 @@ def main():
                     f"jawOpen={jaw_open_score:.2f} (> {JAW_OPEN_SCORE_THRESHOLD})"
                 )
 
-            # 표정 요약 및 상위 블렌드셰이프
-            if blendshape_scores:
-                emotion_result = summarize_emotion(blendshape_scores)
-                top_blendshapes = sorted(blendshape_scores.items(), key=lambda kv: kv[1], reverse=True)[:BLENDSHAPE_TOP_K]
+            # 표정 요약 및 상위 블렌드셰이프 (화면 표시용이라 몇 프레임마다 갱신)
+            if categories is not None:
+                if emotion_result is None or frame_count % EMOTION_INTERVAL == 0:
+                    emotion_result = summarize_emotion(blendshape_scores, blendshape_index)
+                    # 전체 정렬 없이 상위 K개만 골라서 그 K개만 정렬
+                    top_idx = np.argpartition(blendshape_scores, -BLENDSHAPE_TOP_K)[-BLENDSHAPE_TOP_K:]
+                    top_idx = top_idx[np.argsort(-blendshape_scores[top_idx])]
+                    top_blendshapes = [(blendshape_index.names[i], float(blendshape_scores[i])) for i in top_idx]
             else:
                 emotion_result = None
                 top_blendshapes = []
 
             # 얼굴 윤곽 및 랜드마크 표시
-            xs = [pt[0] for pt in pixel_landmarks.values()]
-            ys = [pt[1] for pt in pixel_landmarks.values()]
-            x_min, x_max = int(np.min(xs)), int(np.max(xs))
-            y_min, y_max = int(np.min(ys)), int(np.max(ys))
-            cv2.rectangle(frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-
-            cv2.polylines(frame, [np.int32(left_eye)], True, (0, 255, 255), 1)
-            cv2.polylines(frame, [np.int32(right_eye)], True, (0, 255, 255), 1)
-            mouth_poly = np.array([
-                mouth_points["left"],
-                mouth_points["upper_left"],
-                mouth_points["upper"],
-                mouth_points["upper_right"],
-                mouth_points["right"],
-                mouth_points["lower_right"],
-                mouth_points["lower"],
-                mouth_points["lower_left"],
-            ], dtype=np.int32)
-            cv2.polylines(frame, [mouth_poly], True, (0, 255, 255), 1)
+            # (정수 좌표/윤곽선 점은 미리 만들어 둔 int32 버퍼에 덮어씀)
+            if points is None:
+                points = np.empty(pixel_landmarks.shape, dtype=np.int32)
+            np.copyto(points, pixel_landmarks, casting="unsafe")  # astype(np.int32)처럼 소수점 버림
+            x, y, w, h = cv2.boundingRect(points)
+            cv2.rectangle(frame, (x, y), (x + w - 1, y + h - 1), (0, 255, 0), 2)
+
+            for indices, outline in zip(OUTLINE_INDICES, outlines):
+                np.take(points, indices, axis=0, out=outline, mode="clip")
+            cv2.polylines(frame, outlines, True, (0, 255, 255), 1)
 
         else:
             # 얼굴이 감지되지 않으면 상태 리셋
@@ -438,22 +814,22 @@ def main():
             (current_mar > MAR_THRESHOLD) or (jaw_open_score >= JAW_OPEN_SCORE_THRESHOLD)
         )
 
-        current_time = time.time()
+        frame_events = []  # 이번 프레임에서 보낼 이벤트 (한 번에 전송)
 
         if eye_closed_now:
             if eye_closed_start is None:
                 eye_closed_start = current_time
                 logger.info(f"눈 감기 시작 - EAR: {current_ear:.3f}, blink: {blink_score:.2f}")
-            elif current_time - eye_closed_start >= DROWSY_TIME:
+            elif current_time - eye_closed_start >= DROWSY_TIME_NS:
                 if not is_drowsy:
                     logger.warning(
                         f"졸림 감지! - {DROWSY_TIME}초 경과, EAR: {current_ear:.3f}, blink: {blink_score:.2f}"
                     )
-                    pipe_fd = send_event(pipe_fd, "DROWSY")
+                    frame_events.append("DROWSY")
                 is_drowsy = True
         else:
             if eye_closed_start is not None:
-                duration = current_time - eye_closed_start
+                duration = (current_time - eye_closed_start) / NS_PER_SEC
                 logger.info(
                     f"눈 뜸 - EAR: {current_ear:.3f}, blink: {blink_score:.2f}, 감은 시간: {duration:.2f}초"
                 )
@@ -464,106 +840,61 @@ def main():
             if yawn_start is None:
                 yawn_start = current_time
                 logger.info(f"입 벌림 시작 - MAR: {current_mar:.3f}, jawOpen: {jaw_open_score:.2f}")
-            elif current_time - yawn_start >= YAWN_TIME:
+            elif current_time - yawn_start >= YAWN_TIME_NS:
                 if not is_yawning:
                     logger.warning(f"하품 감지! - MAR: {current_mar:.3f}, jawOpen: {jaw_open_score:.2f}")
-                    pipe_fd = send_event(pipe_fd, "YAWN")
+                    frame_events.append("YAWN")
                 is_yawning = True
         else:
             yawn_start = None
             is_yawning = False
 
+        if frame_events:
+            event_writer.send(frame_events)
+
         # 결과 표시 영역 (화면 왼쪽 상단)
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (340, 330), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.6, frame, 0.4, 0, frame)
+        # 반투명 검은 패널 + 고정 제목: 해당 영역만 40% 밝기로 낮추고 미리 그려 둔 제목을 합성
+        # (전체 프레임 복사 없이 ROI에서 바로 처리, 제목 글자는 매 프레임 다시 그리지 않음)
+        status_panel.paste(frame[PANEL_Y0:PANEL_Y1, PANEL_X0:PANEL_X1])
 
-        y_pos = 35
-        cv2.putText(frame, "=== Status ===", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.55, (255, 255, 255), 2)
+        # EAR/MAR/Blink/JawOpen 수치 ("=== Status ===" 아래)
+        values = (current_ear, current_mar, blink_score, jaw_open_score)
+        for (y_pos, fmt, exceeds, threshold), value in zip(STATUS_ROWS, values):
+            color = (0, 0, 255) if exceeds(value, threshold) else (200, 200, 200)
+            cv2.putText(frame, fmt.format(value), (20, y_pos), cv2.FONT_HERSHEY_SIMPLEX, 0.45, color, 1)
 
-        # EAR/MAR 표시
-        y_pos += 25
-        ear_color = (0, 0, 255) if current_ear < EAR_THRESHOLD else (200, 200, 200)
-        cv2.putText(frame, f"EAR: {current_ear:.2f} (< {EAR_THRESHOLD})", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, ear_color, 1)
-        y_pos += 20
-        mar_color = (0, 0, 255) if current_mar > MAR_THRESHOLD else (200, 200, 200)
-        cv2.putText(frame, f"MAR: {current_mar:.2f} (> {MAR_THRESHOLD})", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, mar_color, 1)
-        y_pos += 20
-        blink_color = (0, 0, 255) if blink_score >= BLINK_SCORE_THRESHOLD else (200, 200, 200)
-        cv2.putText(frame, f"Blink: {blink_score:.2f} (> {BLINK_SCORE_THRESHOLD})", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, blink_color, 1)
-        y_pos += 20
-        jaw_color = (0, 0, 255) if jaw_open_score >= JAW_OPEN_SCORE_THRESHOLD else (200, 200, 200)
-        cv2.putText(frame, f"JawOpen: {jaw_open_score:.2f} (> {JAW_OPEN_SCORE_THRESHOLD})", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, jaw_color, 1)
-
-        # 눈 감은 시간 표시
-        y_pos += 20
+        # 눈 감은 시간 표시 (감고 있는 동안만 매 프레임 갱신)
         if eye_closed_start is not None:
-            closed_duration = time.time() - eye_closed_start
-            cv2.putText(frame, f"Eyes closed: {closed_duration:.1f}s / {DROWSY_TIME:.1f}s", (20, y_pos),
+            closed_duration = (current_time - eye_closed_start) / NS_PER_SEC
+            cv2.putText(frame, f"Eyes closed: {closed_duration:.1f}s / {DROWSY_TIME:.1f}s", (20, 140),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1)
-        else:
-            cv2.putText(frame, "Eyes: Open", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (200, 200, 200), 1)
 
-        # 졸림/하품 상태 표시
-        y_pos += 25
-        if is_drowsy:
-            cv2.putText(frame, "DROWSY!", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-        else:
-            cv2.putText(frame, "Drowsy: No", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
+        # 눈/졸림/하품 상태 문구 (상태 조합별로 한 번만 그려 둔 스프라이트)
+        render_state_sprite(eye_closed_start is None, is_drowsy, is_yawning).paste(
+            frame[STATE_Y0:STATE_Y1, PANEL_X0:PANEL_X1])
 
-        y_pos += 25
-        if is_yawning:
-            cv2.putText(frame, "YAWNING!", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 165, 255), 2)
-        else:
-            cv2.putText(frame, "Yawn: No", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 0), 1)
-
-        # 표정 결과 표시
-        y_pos += 30
-        cv2.putText(frame, "=== Emotion ===", (20, y_pos),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.55, (255, 255, 255), 2)
-
-        if emotion_result:
-            label, confidence = emotion_result
-            y_pos += 25
-            color = (0, 255, 0) if confidence > 0.5 else (0, 255, 255)
-            cv2.putText(frame, f"{label}: {confidence*100:.1f}%", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.55, color, 2)
-        if top_blendshapes:
-            y_pos += 22
-            cv2.putText(frame, "Top blendshapes:", (20, y_pos),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.45, (200, 200, 200), 1)
-            for name, score in top_blendshapes:
-                y_pos += 18
-                cv2.putText(frame, f"- {name}: {score:.2f}", (20, y_pos),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (160, 160, 160), 1)
+        # 표정 결과 표시 ("=== Emotion ===" 아래, 결과가 바뀔 때만 다시 그림)
+        emotion_key = (emotion_result, tuple(top_blendshapes))
+        if emotion_key != last_emotion_key:
+            emotion_sprite = render_emotion_sprite(emotion_result, top_blendshapes)
+            last_emotion_key = emotion_key
+        emotion_sprite.paste(frame[EMOTION_Y0:PANEL_Y1, PANEL_X0:PANEL_X1])
 
         # 경고 알림 (화면 중앙 상단) + 경고음
-        current_time = time.time()
         if is_drowsy or is_yawning:
             # 화면 중앙 상단에 Wake up 경고
-            text = "Wake up!"
-            text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.5, 3)[0]
-            text_x = (frame.shape[1] - text_size[0]) // 2
-            cv2.putText(frame, text, (text_x, 60),
+            text_x = (frame.shape[1] - WAKE_UP_SIZE[0]) // 2
+            cv2.putText(frame, WAKE_UP_TEXT, (text_x, 60),
                         cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3)
             # 경고음 재생 (쿨다운 적용)
-            if current_time - last_alert_time > ALERT_COOLDOWN:
-                play_alert_sound()
+            if current_time - last_alert_time > ALERT_COOLDOWN_NS:
+                play_alert_sound(alert_sound)
                 last_alert_time = current_time
                 logger.warning(f"경고음 재생 - 졸림:{is_drowsy}, 하품:{is_yawning}")
 
         # 화면 출력
         cv2.imshow(window_name, frame)
+        reader.release(frame)  # imshow는 내용을 복사하므로 버퍼를 캡처 스레드에 돌려줌
 
         # 종료 조건 확인 (ESC키, q키, 또는 창 닫기)
         key = cv2.waitKey(1) & 0xFF
@@ -571,16 +902,17 @@ def main():
             logger.info("키 입력으로 종료")
             break
 
-        # 창이 닫혔는지 확인 (X 버튼 클릭)
-        if cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
+        # 창이 닫혔는지 확인 (X 버튼 클릭, 몇 프레임마다 한 번만)
+        if (frame_count % WINDOW_CHECK_INTERVAL == 0
+                and cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1):
             logger.info("창 닫기로 종료")
             break
 
     # 정리
+    reader.stop()
     cap.release()
     cv2.destroyAllWindows()
-    if pipe_fd is not None:
-        os.close(pipe_fd)
+    event_writer.stop()
     if os.path.exists(PIPE_PATH):
         os.remove(PIPE_PATH)
     logger.info("프로그램 종료")
@@ -594,4 +926,5 @@ if __name__ == "__main__":
         logger.info("Ctrl+C 감지 - 프로그램 종료")
         cv2.destroyAllWindows()
     finally:
+        log_listener.stop()  # 큐에 남은 로그를 모두 기록한 뒤 종료
         logging.shutdown()